@@ -3,14 +3,31 @@ Advanced Context Understanding
 Enhanced context management with semantic understanding.
 """
 
+import heapq
 import logging
-from collections import deque
+import re
+import sys
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-
-
-@dataclass
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+# How many recent entities each pronoun refers to; other pronouns get 3
+_PRONOUN_LIMITS = {
+    "those": 5,
+    "them": 5,
+    "these": 5,
+    "that": 1,
+    "it": 1,
+    "this": 1,
+    "same": 3,
+}
+
+
+@dataclass(slots=True)
 class ContextEntity:
     """Represents an entity mentioned in conversation."""
 
@@ -22,9 +39,13 @@ class ContextEntity:
     reference_count: int = 0
     confidence: float = 1.0
 
-    def update_reference(self):
-        """Update when entity was last referenced."""
-        self.last_referenced = datetime.now()
+    def __post_init__(self):
+        # Entity types come from a small fixed set and are compared constantly
+        self.entity_type = sys.intern(self.entity_type)
+
+    def update_reference(self, when: Optional[datetime] = None):
+        """Update when entity was last referenced (now unless given)."""
+        self.last_referenced = when or datetime.now()
         self.reference_count += 1
 
 
@@ -53,74 +74,88 @@ class SemanticRelation:
     created: datetime = field(default_factory=datetime.now)
 
 
+# Patterns for different entity types
+_ENTITY_PATTERNS: Dict[str, List[str]] = {
+    "file": [
+        r"\b([^\s]+\.(?:txt|pdf|doc|docx|py|js|html|css|json|xml|log|md))\b",
+        r"(?:file|document)s?\s+(?:named|called)?\s*([^\s]+\.[a-zA-Z]{1,4})",
+        r"([^\s]+\.[a-zA-Z]{1,4})\s+(?:file|document)s?",
+        r"(?:all\s+)?(\.[a-zA-Z]{2,4})\s+files?",  # ".txt files"
+    ],
+    "directory": [
+        r"(?:directory|folder|dir)\s+(?:named|called)?\s*([^\s]+)",
+        r"([^\s]+)\s+(?:directory|folder|dir)",
+        r"\bin\s+(?:the\s+)?([^\s/]+)/?(?:\s|$)",
+    ],
+    "process": [
+        r"(?:process|pid)\s+(?:named|called)?\s*([^\s]+)",
+        r"([^\s]+)\s+(?:process|pid)",
+        r"(?:kill|stop|terminate)\s+([^\s]+)",
+    ],
+    "container": [
+        r"(?:container|docker)\s+(?:named|called)?\s*([^\s]+)",
+        r"([^\s]+)\s+(?:container)",
+    ],
+    "size": [
+        r"(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
+        r"(?:larger|bigger|greater)\s+than\s+(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
+        r"(?:smaller|less)\s+than\s+(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
+    ],
+    "time": [
+        r"(?:in\s+the\s+)?(?:last|past)\s+(\d+)\s+"
+        r"(seconds?|minutes?|hours?|days?|weeks?|months?)",
+        r"(?:modified|changed|created)\s+(?:in\s+the\s+)?"
+        r"(?:last\s+)?(\w+(?:\s+\w+)?)",
+        r"(today|yesterday|this\s+week|last\s+week|this\s+month)",
+    ],
+}
+
+# Compiled at import so every extractor starts with a ready pattern list
+_COMPILED_ENTITY_PATTERNS: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+    (entity_type, re.compile(pattern))
+    for entity_type, patterns in _ENTITY_PATTERNS.items()
+    for pattern in patterns
+)
+
+
 class EntityExtractor:
     """Extracts entities from user input."""
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-        # Patterns for different entity types
-        self.entity_patterns = {
-            "file": [
-                r"\b([^\s]+\.(?:txt|pdf|doc|docx|py|js|html|css|json|xml|"
-                r"log|md))\b",
-                r"(?:file|document)s?\s+(?:named|called)?\s*([^\s]+\."
-                r"[a-zA-Z]{1,4})",
-                r"([^\s]+\.[a-zA-Z]{1,4})\s+(?:file|document)s?",
-                r"(?:all\s+)?(\.[a-zA-Z]{2,4})\s+files?",  # ".txt files"
-            ],
-            "directory": [
-                r"(?:directory|folder|dir)\s+(?:named|called)?\s*([^\s]+)",
-                r"([^\s]+)\s+(?:directory|folder|dir)",
-                r"\bin\s+(?:the\s+)?([^\s/]+)/?(?:\s|$)",
-            ],
-            "process": [
-                r"(?:process|pid)\s+(?:named|called)?\s*([^\s]+)",
-                r"([^\s]+)\s+(?:process|pid)",
-                r"(?:kill|stop|terminate)\s+([^\s]+)",
-            ],
-            "container": [
-                r"(?:container|docker)\s+(?:named|called)?\s*([^\s]+)",
-                r"([^\s]+)\s+(?:container)",
-            ],
-            "size": [
-                r"(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
-                r"(?:larger|bigger|greater)\s+than\s+"
-                r"(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
-                r"(?:smaller|less)\s+than\s+" r"(\d+(?:\.\d+)?\s*(?:b|kb|mb|gb|tb))",
-            ],
-            "time": [
-                r"(?:in\s+the\s+)?(?:last|past)\s+(\d+)\s+"
-                r"(seconds?|minutes?|hours?|days?|weeks?|months?)",
-                r"(?:modified|changed|created)\s+(?:in\s+the\s+)?"
-                r"(?:last\s+)?(\w+(?:\s+\w+)?)",
-                r"(today|yesterday|this\s+week|last\s+week|this\s+month)",
-            ],
-        }
+        # Patterns for different entity types, compiled once at import
+        self.entity_patterns = _ENTITY_PATTERNS
+        self._compiled_patterns = _COMPILED_ENTITY_PATTERNS
+
+        # Users repeat themselves; identical inputs reuse the previous scan
+        self._scan = lru_cache(maxsize=4096)(self._scan_matches)
 
     def extract_entities(self, text: str) -> List[ContextEntity]:
         """Extract entities from text."""
-        entities = []
-        text_lower = text.lower()
+        # Entities are built fresh on every call because memory mutates them
+        return [
+            ContextEntity(
+                name=name,
+                entity_type=entity_type,
+                confidence=0.7,  # Pattern-based extraction
+            )
+            for entity_type, name in self._scan(text.lower())
+        ]
 
-        import re
+    def _scan_matches(self, text_lower: str) -> Tuple[Tuple[str, str], ...]:
+        """Find (entity_type, name) pairs in lowercased text."""
+        matches = []
 
-        for entity_type, patterns in self.entity_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text_lower)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        match = match[0] if match else ""
+        for entity_type, pattern in self._compiled_patterns:
+            for match in pattern.findall(text_lower):
+                if isinstance(match, tuple):
+                    match = match[0] if match else ""
 
-                    if match and len(match.strip()) > 0:
-                        entity = ContextEntity(
-                            name=match.strip(),
-                            entity_type=entity_type,
-                            confidence=0.7,  # Pattern-based extraction
-                        )
-                        entities.append(entity)
+                if match and len(match.strip()) > 0:
+                    matches.append((entity_type, match.strip()))
 
-        return entities
+        return tuple(matches)
 
 
 class ConversationMemory:
@@ -129,18 +164,24 @@ class ConversationMemory:
     def __init__(self, max_turns: int = 50):
         self.max_turns = max_turns
         self.turns: deque = deque(maxlen=max_turns)
+        self.successful_turns = 0  # Kept in step with the turns window
         self.entities: Dict[str, ContextEntity] = {}
         self.relations: List[SemanticRelation] = []
         self.logger = logging.getLogger(__name__)
 
     def add_turn(self, turn: ConversationTurn) -> None:
         """Add a conversation turn."""
+        if len(self.turns) == self.turns.maxlen:
+            # The deque drops its oldest turn (or this one, if it has no room)
+            dropped = self.turns[0] if self.turns else turn
+            self.successful_turns -= bool(dropped.success)
+        self.successful_turns += bool(turn.success)
         self.turns.append(turn)
 
-        # Update entity references
+        # Update entity references; every mention shares the turn's timestamp
         for entity_name in turn.entities_mentioned:
             if entity_name in self.entities:
-                self.entities[entity_name].update_reference()
+                self.entities[entity_name].update_reference(turn.timestamp)
 
     def add_entity(self, entity: ContextEntity) -> None:
         """Add or update an entity."""
@@ -158,14 +199,22 @@ class ConversationMemory:
         self.relations.append(relation)
 
     def get_recent_turns(self, count: int = 5) -> List[ConversationTurn]:
-        """Get recent conversation turns."""
-        return list(self.turns)[-count:]
+        """Get recent conversation turns, oldest first."""
+        # Walk back from the newest turn so only the requested turns are copied
+        recent = list(islice(reversed(self.turns), max(count, 0)))
+        recent.reverse()
+        return recent
 
     def get_relevant_entities(self, text: str, limit: int = 10) -> List[ContextEntity]:
         """Get entities relevant to the current text."""
         text_lower = text.lower()
         scored_entities = []
 
+        # Recency cutoffs are computed once rather than per entity
+        now = datetime.now()
+        recent_cutoff = now - timedelta(minutes=5)
+        stale_cutoff = now - timedelta(minutes=30)
+
         for entity in self.entities.values():
             score = 0.0
 
@@ -174,10 +223,9 @@ class ConversationMemory:
                 score += 1.0
 
             # Recent reference bonus
-            time_since_reference = datetime.now() - entity.last_referenced
-            if time_since_reference < timedelta(minutes=5):
+            if entity.last_referenced > recent_cutoff:
                 score += 0.5
-            elif time_since_reference < timedelta(minutes=30):
+            elif entity.last_referenced > stale_cutoff:
                 score += 0.2
 
             # Frequency bonus
@@ -189,43 +237,34 @@ class ConversationMemory:
             if score > 0:
                 scored_entities.append((entity, score))
 
-        # Sort by score and return top entities
-        scored_entities.sort(key=lambda x: x[1], reverse=True)
-        return [entity for entity, score in scored_entities[:limit]]
+        # Select the top entities without sorting the whole list
+        top_entities = heapq.nlargest(limit, scored_entities, key=itemgetter(1))
+        return [entity for entity, score in top_entities]
 
     def resolve_pronoun(
         self, pronoun: str, context_type: Optional[str] = None
     ) -> List[str]:
         """Resolve pronouns to specific entities."""
-        pronoun_lower = pronoun.lower()
-
-        # Get recently mentioned entities
-        recent_entities = []
+        limit = _PRONOUN_LIMITS.get(pronoun.lower(), 3)
 
-        # Look at last few turns
-        recent_turns = self.get_recent_turns(3)
-        for turn in reversed(recent_turns):
-            recent_entities.extend(turn.entities_mentioned)
+        # Recently mentioned entities, newest turn first
+        recent_entities = (
+            entity_name
+            for turn in reversed(self.get_recent_turns(3))
+            for entity_name in turn.entities_mentioned
+        )
 
         # Filter by type if specified
         if context_type:
-            filtered_entities = []
-            for entity_name in recent_entities:
-                if entity_name in self.entities:
-                    entity = self.entities[entity_name]
-                    if entity.entity_type == context_type:
-                        filtered_entities.append(entity_name)
-            recent_entities = filtered_entities
-
-        # Return based on pronoun type
-        if pronoun_lower in ["those", "them", "these"]:
-            return recent_entities[:5]  # Multiple entities
-        elif pronoun_lower in ["that", "it", "this"]:
-            return recent_entities[:1]  # Single entity
-        elif pronoun_lower == "same":
-            return recent_entities[:3]  # Same as before
-
-        return recent_entities[:3]
+            recent_entities = (
+                entity_name
+                for entity_name in recent_entities
+                if entity_name in self.entities
+                and self.entities[entity_name].entity_type == context_type
+            )
+
+        # Stop as soon as enough entities are found
+        return list(islice(recent_entities, limit))
 
     def get_context_summary(self) -> Dict[str, Any]:
         """Get a summary of current context."""
@@ -248,6 +287,14 @@ class AdvancedContextManager:
         self.context_stack: List[Dict[str, Any]] = []
         self.logger = logging.getLogger(__name__)
 
+    def reset(self) -> None:
+        """Forget the conversation, focus and context stack."""
+        self.conversation_memory = ConversationMemory(
+            max_turns=self.conversation_memory.max_turns
+        )
+        self.current_focus = None
+        self.context_stack.clear()
+
     def process_input(
         self, user_input: str, basic_context: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -368,45 +415,39 @@ class AdvancedContextManager:
 
     def analyze_patterns(self) -> Dict[str, Any]:
         """Analyze conversation patterns for insights."""
-        turns = list(self.conversation_memory.turns)
+        # The deque supports len() and repeated iteration, so no copy is needed
+        turns = self.conversation_memory.turns
 
         if not turns:
             return {"patterns": [], "insights": []}
 
-        # Analyze command patterns
-        commands = [turn.command_generated for turn in turns if turn.command_generated]
-        command_frequency = {}
-        for cmd in commands:
-            base_cmd = cmd.split()[0] if cmd else ""
-            command_frequency[base_cmd] = command_frequency.get(base_cmd, 0) + 1
+        # Analyze command patterns; only the first word of each command is needed
+        command_frequency = Counter(
+            turn.command_generated.split(None, 1)[0]
+            for turn in turns
+            if turn.command_generated
+        )
 
         # Analyze entity patterns
-        entity_types = {}
-        for entity in self.conversation_memory.entities.values():
-            entity_types[entity.entity_type] = (
-                entity_types.get(entity.entity_type, 0) + 1
-            )
+        entity_types = Counter(
+            entity.entity_type for entity in self.conversation_memory.entities.values()
+        )
 
         # Success rate
-        successful_turns = sum(1 for turn in turns if turn.success)
-        success_rate = successful_turns / len(turns) if turns else 0
+        success_rate = self.conversation_memory.successful_turns / len(turns)
 
         insights = []
         if success_rate < 0.7:
             insights.append("Consider providing more specific commands")
 
-        most_used_cmd = (
-            max(command_frequency.items(), key=lambda x: x[1])
-            if command_frequency
-            else None
-        )
-        if most_used_cmd:
-            insights.append(f"Most frequently used command: {most_used_cmd[0]}")
+        if command_frequency:
+            most_used_cmd, _ = command_frequency.most_common(1)[0]
+            insights.append(f"Most frequently used command: {most_used_cmd}")
 
         return {
             "patterns": {
-                "command_frequency": command_frequency,
-                "entity_types": entity_types,
+                "command_frequency": dict(command_frequency),
+                "entity_types": dict(entity_types),
                 "success_rate": success_rate,
                 "total_turns": len(turns),
             },
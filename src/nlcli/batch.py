@@ -4,11 +4,30 @@ Support for executing commands in batch mode and script files.
 """
 
 import logging
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Classifies a stripped script line with one match. Alternatives are tried in
+# order: comments, metadata and commands win over "=" assignments, and lines
+# starting with "var:" fall through to modifiers.
+_LINE_KIND = re.compile(
+    r"(?P<comment>#)"
+    r"|(?P<metadata>@)"
+    r"|(?P<command>>)"
+    r"|(?P<variable>(?!var:).*=)"
+    r"|(?P<modifier>)"
+)
+
+# ${NAME} takes any name up to the closing brace; bare $NAME takes one word.
+_VARIABLE_REF = re.compile(r"\$\{([^}]*)\}|\$(\w+)")
+
+# Intent argument meaning "plan it here"; None means planning found nothing
+_UNPLANNED = object()
 
 
 @dataclass
@@ -61,14 +80,20 @@ class BatchScriptParser:
         if not script_path.exists():
             raise FileNotFoundError(f"Script file not found: {script_path}")
 
-        content = script_path.read_text(encoding="utf-8")
-        return self.parse_content(content, script_path)
+        # Stream the file line by line instead of reading it into one string
+        with script_path.open(encoding="utf-8") as script_file:
+            return self._parse_lines(script_file, script_path)
 
     def parse_content(
         self, content: str, script_path: Optional[Path] = None
     ) -> BatchScript:
         """Parse batch script content."""
-        lines = content.split("\n")
+        return self._parse_lines(content.split("\n"), script_path)
+
+    def _parse_lines(
+        self, lines: Iterable[str], script_path: Optional[Path]
+    ) -> BatchScript:
+        """Parse batch script lines; trailing newlines are stripped with the rest."""
         commands = []
         variables = {}
         metadata = {}
@@ -78,28 +103,23 @@ class BatchScriptParser:
             current_line += 1
             line = line.strip()
 
-            # Skip empty lines and comments
-            if not line or line.startswith("#"):
+            # Skip empty lines
+            if not line:
                 continue
 
-            # Parse metadata (starts with @)
-            if line.startswith("@"):
-                self._parse_metadata_line(line, metadata)
-                continue
+            kind = _LINE_KIND.match(line).lastgroup
 
-            # Parse variable assignments (but not command modifiers)
-            if "=" in line and not line.startswith(">") and not line.startswith("var:"):
+            if kind == "metadata":
+                # Parse metadata (starts with @)
+                self._parse_metadata_line(line, metadata)
+            elif kind == "variable":
+                # Parse variable assignments (but not command modifiers)
                 self._parse_variable_line(line, variables)
-                continue
-
-            # Parse commands (natural language starting with >)
-            if line.startswith(">"):
-                command = self._parse_command_line(line, current_line)
-                commands.append(command)
-                continue
-
-            # Parse command modifiers (depends, condition, etc.)
-            if commands:  # Apply to last command
+            elif kind == "command":
+                # Parse commands (natural language starting with >)
+                commands.append(self._parse_command_line(line, current_line))
+            elif kind == "modifier" and commands:
+                # Parse command modifiers (depends, condition, etc.)
                 self._parse_modifier_line(line, commands[-1])
 
         return BatchScript(
@@ -190,38 +210,63 @@ class BatchExecutor:
         # Build execution plan
         execution_order = self._build_execution_order(script.commands)
 
-        if max_parallel == 1:
+        if max_parallel <= 1:
             # Sequential execution
             return self._execute_sequential(execution_order, dry_run, stop_on_error)
         else:
-            # Parallel execution (simplified for now)
-            return self._execute_sequential(execution_order, dry_run, stop_on_error)
+            # Parallel execution within each dependency group
+            return self._execute_parallel(
+                execution_order, dry_run, stop_on_error, max_parallel
+            )
 
     def _build_execution_order(
         self, commands: List[BatchCommand]
     ) -> List[List[BatchCommand]]:
-        """Build execution order respecting dependencies."""
-        # For now, simple approach: respect line order and basic dependencies
-        # In a full implementation, this would use topological sorting
+        """
+        Build execution order respecting dependencies.
+
+        Uses Kahn's algorithm: each command counts the distinct lines it still
+        waits on, and completing a line releases its waiters, so every
+        dependency edge is visited once. Commands that become ready together
+        form one group, in script order.
+        """
+        pending = []
+        waiters: Dict[int, List[int]] = {}
+        for index, cmd in enumerate(commands):
+            dependencies = set(cmd.depends_on)
+            pending.append(len(dependencies))
+            for line_number in dependencies:
+                waiters.setdefault(line_number, []).append(index)
 
         execution_groups = []
-        remaining_commands = commands.copy()
-
-        while remaining_commands:
-            # Find commands with no unmet dependencies
-            ready_commands = []
-            for cmd in remaining_commands:
-                if self._dependencies_satisfied(cmd, execution_groups):
-                    ready_commands.append(cmd)
+        completed_lines = set()
+        scheduled = [False] * len(commands)
+        ready = [index for index, count in enumerate(pending) if count == 0]
+        remaining = len(commands)
 
-            if not ready_commands:
+        while remaining:
+            if not ready:
                 # Circular dependency or other issue, just take the first
-                ready_commands = [remaining_commands[0]]
+                ready = [scheduled.index(False)]
                 self.logger.warning("Possible circular dependency detected")
 
-            execution_groups.append(ready_commands)
-            for cmd in ready_commands:
-                remaining_commands.remove(cmd)
+            group = sorted(ready)
+            ready = []
+            for index in group:
+                scheduled[index] = True
+            remaining -= len(group)
+
+            for index in group:
+                line_number = commands[index].line_number
+                if line_number in completed_lines:
+                    continue
+                completed_lines.add(line_number)
+                for waiter in waiters.get(line_number, ()):
+                    pending[waiter] -= 1
+                    if pending[waiter] == 0 and not scheduled[waiter]:
+                        ready.append(waiter)
+
+            execution_groups.append([commands[index] for index in group])
 
         return execution_groups
 
@@ -263,23 +308,11 @@ class BatchExecutor:
                 # Substitute variables
                 processed_command = self._substitute_variables(command)
 
-                # Execute command
-                result = self._execute_command(processed_command, dry_run)
-                self.results.append(result)
-
-                # Handle retry
-                if not result.success and command.retry_count > 0:
-                    for retry in range(command.retry_count):
-                        self.logger.info(
-                            f"Retrying command (attempt {retry + 1}/"
-                            f"{command.retry_count})"
-                        )
-                        time.sleep(1)  # Wait before retry
-
-                        retry_result = self._execute_command(processed_command, dry_run)
-                        if retry_result.success:
-                            result = retry_result
-                            break
+                # Execute command, retrying on failure
+                first_result, result = self._execute_with_retry(
+                    processed_command, dry_run
+                )
+                self.results.append(first_result)
 
                 # Check if we should stop on error
                 if stop_on_error and not result.success:
@@ -290,6 +323,115 @@ class BatchExecutor:
 
         return self.results
 
+    def _execute_parallel(
+        self,
+        execution_groups: List[List[BatchCommand]],
+        dry_run: bool,
+        stop_on_error: bool,
+        max_parallel: int,
+    ) -> List[BatchResult]:
+        """Execute the independent commands of each group concurrently."""
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            for group in execution_groups:
+                if len(group) == 1 or any(
+                    self._depends_on_previous_result(command) for command in group
+                ):
+                    # success/failure conditions look at the previous result,
+                    # so those groups keep their script order
+                    self._execute_sequential([group], dry_run, stop_on_error)
+                    continue
+
+                # Substitute and plan up front, and give each worker its own
+                # variables dict, so workers never touch shared state
+                processed = [self._substitute_variables(command) for command in group]
+                intents = self._plan_group(processed)
+                if intents is None:
+                    # Plan each command on this thread instead
+                    self._execute_sequential([group], dry_run, stop_on_error)
+                    continue
+
+                updates: List[Dict[str, str]] = [{} for _ in processed]
+                futures = [
+                    pool.submit(
+                        self._execute_with_retry, command, dry_run, intent, variables
+                    )
+                    for command, intent, variables in zip(processed, intents, updates)
+                ]
+
+                # Record results and variables in script order, not completion
+                # order, so LAST_OUTPUT matches a sequential run
+                for index, future in enumerate(futures):
+                    first_result, result = future.result()
+                    self.results.append(first_result)
+                    self.variables.update(updates[index])
+
+                    if stop_on_error and not result.success:
+                        self.logger.error(
+                            f"Stopping execution due to error: {result.error}"
+                        )
+                        # Like a sequential run, skip the rest of the group
+                        for pending in futures[index + 1 :]:
+                            pending.cancel()
+                        break
+
+        return self.results
+
+    def _plan_group(
+        self, commands: List[BatchCommand]
+    ) -> Optional[List[Optional[Any]]]:
+        """
+        Plan a group of independent commands in one call.
+
+        Returns None if batch planning fails.
+        """
+        from nlcli.engine import plan_and_generate_batch
+
+        try:
+            return plan_and_generate_batch(
+                [command.natural_language for command in commands],
+                self.session_context,
+                self.tool_registry,
+                self.llm,
+            )
+        except Exception as e:
+            self.logger.warning(f"Batch planning failed: {e}")
+            return None
+
+    def _execute_with_retry(
+        self,
+        command: BatchCommand,
+        dry_run: bool,
+        intent: Any = _UNPLANNED,
+        variables: Optional[Dict[str, str]] = None,
+    ) -> Tuple[BatchResult, BatchResult]:
+        """Execute a command and retry failures; return first and final results."""
+        first_result = result = self._execute_command(
+            command, dry_run, intent, variables
+        )
+
+        if not result.success and command.retry_count > 0:
+            for retry in range(command.retry_count):
+                self.logger.info(
+                    f"Retrying command (attempt {retry + 1}/{command.retry_count})"
+                )
+                time.sleep(1)  # Wait before retry
+
+                retry_result = self._execute_command(
+                    command, dry_run, intent, variables
+                )
+                if retry_result.success:
+                    result = retry_result
+                    break
+
+        return first_result, result
+
+    def _depends_on_previous_result(self, command: BatchCommand) -> bool:
+        """Check whether the command's condition reads the previous result."""
+        return bool(command.condition) and command.condition.lower() in (
+            "success",
+            "failure",
+        )
+
     def _should_execute(self, command: BatchCommand) -> bool:
         """Determine if command should be executed based on condition."""
         if not command.condition:
@@ -316,10 +458,11 @@ class BatchExecutor:
         all_variables = self.variables.copy()
         all_variables.update(command.variables)
 
-        # Simple variable substitution
-        for var_name, var_value in all_variables.items():
-            processed_nl = processed_nl.replace(f"${var_name}", var_value)
-            processed_nl = processed_nl.replace(f"${{{var_name}}}", var_value)
+        # Substitute every reference in one pass; unknown names are kept as-is
+        def lookup(match: re.Match) -> str:
+            return all_variables.get(match.group(1) or match.group(2), match.group(0))
+
+        processed_nl = _VARIABLE_REF.sub(lookup, processed_nl)
 
         # Create new command with substituted text
         new_command = BatchCommand(
@@ -335,20 +478,32 @@ class BatchExecutor:
 
         return new_command
 
-    def _execute_command(self, command: BatchCommand, dry_run: bool) -> BatchResult:
-        """Execute a single command."""
+    def _execute_command(
+        self,
+        command: BatchCommand,
+        dry_run: bool,
+        intent: Any = _UNPLANNED,
+        variables: Optional[Dict[str, str]] = None,
+    ) -> BatchResult:
+        """
+        Execute a single command, planning it unless it was planned already.
+
+        A pre-planned intent of None means the command could not be planned.
+        Output variables go to ``variables`` if given, else to the batch's own.
+        """
         start_time = time.time()
 
         try:
-            # Generate command from natural language
-            from nlcli.engine import plan_and_generate
-
-            intent = plan_and_generate(
-                command.natural_language,
-                self.session_context,
-                self.tool_registry,
-                self.llm,
-            )
+            if intent is _UNPLANNED:
+                # Generate command from natural language
+                from nlcli.engine import plan_and_generate
+
+                intent = plan_and_generate(
+                    command.natural_language,
+                    self.session_context,
+                    self.tool_registry,
+                    self.llm,
+                )
 
             if not intent:
                 return BatchResult(
@@ -374,7 +529,7 @@ class BatchExecutor:
             execution_result = execute(intent.command, self.session_context)
 
             # Update variables from output if needed
-            self._update_variables_from_output(execution_result.output)
+            self._update_variables_from_output(execution_result.output, variables)
 
             return BatchResult(
                 command=command,
@@ -394,11 +549,15 @@ class BatchExecutor:
                 duration=time.time() - start_time,
             )
 
-    def _update_variables_from_output(self, output: str) -> None:
+    def _update_variables_from_output(
+        self, output: str, variables: Optional[Dict[str, str]] = None
+    ) -> None:
         """Update variables from command output (basic implementation)."""
+        if variables is None:
+            variables = self.variables
         # This could parse command output to extract values
         # For now, just store the last output
-        self.variables["LAST_OUTPUT"] = output.strip() if output else ""
+        variables["LAST_OUTPUT"] = output.strip() if output else ""
 
 
 class BatchModeManager:
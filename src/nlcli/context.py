@@ -4,6 +4,7 @@ Handles ephemeral session state and durable preferences.
 """
 
 import os
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +13,9 @@ from typing import Any, Dict, List, Optional
 from rich.console import Console
 from rich.table import Table
 
+# Pronouns resolve_pronouns can rewrite, matched as whole words
+_PRONOUNS = re.compile(r"\b(?:those|them|these|same)\b")
+
 
 @dataclass
 class ExecutionResult:
@@ -152,25 +156,22 @@ class SessionContext:
             # Language support not available
             pass
 
-        pronouns = {
-            "those": self.recent_files[-5:] if self.recent_files else [],
-            "them": self.recent_files[-5:] if self.recent_files else [],
-            "these": self.recent_files[-3:] if self.recent_files else [],
-            "same": self.filters.copy(),
-        }
-
-        # Simple pronoun replacement (would be more sophisticated in practice)
-        for pronoun, replacement in pronouns.items():
-            if pronoun in text.lower():
-                if isinstance(replacement, list) and replacement:
-                    # Replace with file paths
-                    text = text.replace(pronoun, " ".join(replacement[:3]))
-                elif isinstance(replacement, dict) and replacement:
-                    # Use active filters
-                    if "active_path" in replacement:
-                        text = text.replace(pronoun, f"in {replacement['active_path']}")
-
-        return text
+        pronouns = {}
+        if self.recent_files:
+            # Replace with file paths
+            pronouns["those"] = pronouns["them"] = " ".join(self.recent_files[-5:][:3])
+            pronouns["these"] = " ".join(self.recent_files[-3:])
+        if "active_path" in self.filters:
+            # Use active filters
+            pronouns["same"] = f"in {self.filters['active_path']}"
+        if not pronouns:
+            return text
+
+        # Simple pronoun replacement (would be more sophisticated in practice),
+        # in one pass so inserted paths are never rewritten themselves
+        return _PRONOUNS.sub(
+            lambda match: pronouns.get(match.group(), match.group()), text
+        )
 
     def get_context_for_command(self) -> Dict[str, Any]:
         """Get context information for command generation."""
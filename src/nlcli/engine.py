@@ -4,7 +4,7 @@ Enhanced with Phase 4 Production Ready features.
 """
 
 import re
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from nlcli.context import Intent, SessionContext
 from nlcli.llm import LLMConfig, LocalLLM, default_llm
@@ -45,7 +45,7 @@ def enhanced_plan_and_generate(
         from nlcli.error_recovery import ErrorContext, get_error_recovery_manager
         from nlcli.performance import get_performance_profiler
         from nlcli.security import get_security_auditor
-        from nlcli.telemetry import get_telemetry_manager
+        from nlcli.telemetry import Event, EventType, get_telemetry_manager
 
         profiler = get_performance_profiler()
         recovery_manager = get_error_recovery_manager()
@@ -58,11 +58,11 @@ def enhanced_plan_and_generate(
 
             # Record telemetry event
             telemetry.events.log_event(
-                {
-                    "event_type": "command_planning_started",
-                    "session_id": session_id,
-                    "input_length": len(nl_input),
-                }
+                Event(
+                    event_type=EventType.COMMAND_PLANNED,
+                    session_id=session_id,
+                    properties={"input_length": len(nl_input)},
+                )
             )
 
             # Use basic planning with error recovery
@@ -254,6 +254,37 @@ def plan_and_generate(
         return None
 
 
+def plan_and_generate_batch(
+    nl_inputs: List[str],
+    context: SessionContext,
+    tools: ToolRegistry,
+    llm: Optional[LocalLLM] = None,
+) -> List[Optional[Intent]]:
+    """
+    Plan several independent inputs in one call.
+
+    Repeated inputs are planned once and share the resulting intent.
+
+    Args:
+        nl_inputs: Natural language inputs, in order
+        context: Current session context
+        tools: Tool registry
+        llm: Optional local LLM for enhanced understanding
+
+    Returns:
+        One Intent (or None if no match) per input, in input order
+    """
+    if llm is None:
+        llm = default_llm
+
+    planned: Dict[str, Optional[Intent]] = {}
+    for nl_input in nl_inputs:
+        if nl_input not in planned:
+            planned[nl_input] = plan_and_generate(nl_input, context, tools, llm)
+
+    return [planned[nl_input] for nl_input in nl_inputs]
+
+
 def explain(intent: Intent) -> str:
     """
     Generate natural language explanation of what the command will do.
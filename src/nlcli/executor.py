@@ -3,13 +3,43 @@ Command Executor - Safely execute commands with timeouts and resource limits.
 """
 
 import os
+import re
+import shutil
 import signal
 import subprocess
 import time
-from typing import Optional
+from typing import List, Optional
 
 from nlcli.context import ExecutionResult, SessionContext
 
+# Characters that only a shell can interpret (pipes, globs, quoting, ...)
+_SHELL_METACHARACTERS = frozenset("|&;<>()$`\\\"'*?[]{}~#!\n")
+
+# Characters the shell separates words on (newlines never reach the split)
+_WORD_SEPARATORS = re.compile(r"[ \t]+")
+
+
+def _split_simple_command(command: str) -> Optional[List[str]]:
+    """
+    Split a command into argv if it can run without a shell.
+
+    Returns None when the command needs shell features or does not name an
+    executable on PATH (builtins, relative scripts, variable assignments).
+    """
+    if _SHELL_METACHARACTERS.intersection(command):
+        return None
+    # /bin/sh splits words on spaces and tabs only; str.split() would also
+    # break on other Unicode whitespace, such as a no-break space in a name
+    stripped = command.strip(" \t")
+    if not stripped:
+        return None
+    argv = _WORD_SEPARATORS.split(stripped)
+    if "=" in argv[0] or "/" in argv[0]:
+        return None
+    if shutil.which(argv[0]) is None:
+        return None
+    return argv
+
 
 class CommandExecutor:
     """Executor for running system commands safely."""
@@ -42,18 +72,24 @@ class CommandExecutor:
             # Set timeout
             exec_timeout = timeout or self.timeout_seconds
 
+            # Simple commands such as "git status" are executed directly,
+            # saving the intermediate /bin/sh process
+            argv = _split_simple_command(command)
+
             # Execute command using subprocess
             process = subprocess.Popen(
-                command,
-                shell=True,
+                argv or command,
+                shell=argv is None,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
                 cwd=cwd,
                 env=env,
-                preexec_fn=(
-                    os.setsid if os.name != "nt" else None
-                ),  # Process group for cleanup
+                # Own session and process group, so a timeout can kill the whole
+                # tree. Unlike preexec_fn=os.setsid this needs no Python code in
+                # the child, which lets CPython spawn it with vfork instead of
+                # a full fork of this process's address space
+                start_new_session=os.name != "nt",
             )
 
             try:
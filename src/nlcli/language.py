@@ -6,9 +6,45 @@ Provides language detection and translation capabilities.
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+# fastText predictions below this probability fall back to the pattern scorer,
+# which copes better with the two- or three-word inputs typical of a CLI
+_MODEL_MIN_CONFIDENCE = 0.5
+
+_language_model = None
+_language_model_loaded = False
+
+
+def _get_language_model():
+    """
+    Load the fastText language-identification model once per process.
+
+    The model (e.g. lid.176.ftz) is read from NLCLI_LANGUAGE_MODEL. Returns
+    None when fasttext is not installed, no model is configured, or it fails
+    to load.
+    """
+    global _language_model, _language_model_loaded
+    if not _language_model_loaded:
+        _language_model_loaded = True
+        model_path = os.environ.get("NLCLI_LANGUAGE_MODEL")
+        if fasttext is not None and model_path:
+            try:
+                _language_model = fasttext.load_model(model_path)
+            except Exception as e:
+                logging.getLogger(__name__).warning(
+                    f"Failed to load language model {model_path}: {e}"
+                )
+    return _language_model
+
 
 @dataclass
 class LanguageConfig:
@@ -34,63 +70,91 @@ class LanguageConfig:
             ]
 
 
+# Common phrases in different languages for CLI commands
+_LANGUAGE_PATTERNS = {
+    "en": [
+        r"\b(show|list|find|search|delete|remove|copy|move|create)\b",
+        r"\b(files?|directories?|processes?|containers?)\b",
+        r"\b(all|large|small|recent|old)\b",
+    ],
+    "es": [
+        r"\b(mostrar|listar|buscar|encontrar|eliminar|borrar|copiar|mover|crear)\b",
+        r"\b(archivos?|directorios?|procesos?|contenedores?)\b",
+        r"\b(todos?|grandes?|pequeños?|recientes?|viejos?)\b",
+    ],
+    "fr": [
+        r"\b(montrer|afficher|lister|chercher|trouver|supprimer|"
+        r"copier|déplacer|créer)\b",
+        r"\b(fichiers?|répertoires?|processus|conteneurs?)\b",
+        r"\b(tous?|toutes?|grands?|petits?|récents?|anciens?)\b",
+    ],
+    "de": [
+        r"\b(zeigen|anzeigen|auflisten|suchen|finden|löschen|"
+        r"kopieren|verschieben|erstellen)\b",
+        r"\b(dateien?|verzeichnisse?|prozesse?|container?)\b",
+        r"\b(alle?|große?|kleine?|neue?|alte?)\b",
+    ],
+    "pt": [
+        r"\b(mostrar|exibir|listar|buscar|encontrar|deletar|"
+        r"excluir|copiar|mover|criar)\b",
+        r"\b(arquivos?|diretórios?|processos?|contêineres?)\b",
+        r"\b(todos?|grandes?|pequenos?|recentes?|antigos?)\b",
+    ],
+    "it": [
+        r"\b(mostrare|visualizzare|elencare|cercare|trovare|"
+        r"eliminare|copiare|spostare|creare)\b",
+        r"\b(files?|directory|processi|contenitori?)\b",
+        r"\b(tutti?|grandi?|piccoli?|recenti?|vecchi?)\b",
+    ],
+}
+
+# Compiled once at import and shared by every detector
+_COMPILED_LANGUAGE_PATTERNS = {
+    lang: tuple(re.compile(pattern) for pattern in patterns)
+    for lang, patterns in _LANGUAGE_PATTERNS.items()
+}
+
+
 class LanguageDetector:
-    """Simple language detection using word patterns and common phrases."""
+    """
+    Language detection using a fastText model when one is configured, falling
+    back to word patterns and common phrases.
+    """
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.model = _get_language_model()
 
-        # Common phrases in different languages for CLI commands
-        self.language_patterns = {
-            "en": [
-                r"\b(show|list|find|search|delete|remove|copy|move|create)\b",
-                r"\b(files?|directories?|processes?|containers?)\b",
-                r"\b(all|large|small|recent|old)\b",
-            ],
-            "es": [
-                r"\b(mostrar|listar|buscar|encontrar|eliminar|borrar|copiar|"
-                r"mover|crear)\b",
-                r"\b(archivos?|directorios?|procesos?|contenedores?)\b",
-                r"\b(todos?|grandes?|pequeños?|recientes?|viejos?)\b",
-            ],
-            "fr": [
-                r"\b(montrer|afficher|lister|chercher|trouver|supprimer|"
-                r"copier|déplacer|créer)\b",
-                r"\b(fichiers?|répertoires?|processus|conteneurs?)\b",
-                r"\b(tous?|toutes?|grands?|petits?|récents?|anciens?)\b",
-            ],
-            "de": [
-                r"\b(zeigen|anzeigen|auflisten|suchen|finden|löschen|"
-                r"kopieren|verschieben|erstellen)\b",
-                r"\b(dateien?|verzeichnisse?|prozesse?|container?)\b",
-                r"\b(alle?|große?|kleine?|neue?|alte?)\b",
-            ],
-            "pt": [
-                r"\b(mostrar|exibir|listar|buscar|encontrar|deletar|"
-                r"excluir|copiar|mover|criar)\b",
-                r"\b(arquivos?|diretórios?|processos?|contêineres?)\b",
-                r"\b(todos?|grandes?|pequenos?|recentes?|antigos?)\b",
-            ],
-            "it": [
-                r"\b(mostrare|visualizzare|elencare|cercare|trovare|"
-                r"eliminare|copiare|spostare|creare)\b",
-                r"\b(files?|directory|processi|contenitori?)\b",
-                r"\b(tutti?|grandi?|piccoli?|recenti?|vecchi?)\b",
-            ],
-        }
+        # Patterns for CLI phrases per language, compiled once at import
+        self.language_patterns = _LANGUAGE_PATTERNS
+        self._compiled_patterns = _COMPILED_LANGUAGE_PATTERNS
 
     def detect_language(self, text: str) -> Tuple[str, float]:
         """
         Detect language of input text.
         Returns (language_code, confidence)
         """
+        if self.model is not None:
+            try:
+                # fastText rejects newlines, so collapse all whitespace first
+                labels, probabilities = self.model.predict(" ".join(text.split()), k=1)
+            except ValueError as e:
+                # e.g. the fasttext wheel is incompatible with numpy 2
+                self.logger.warning(f"Language model prediction failed: {e}")
+                labels, probabilities = (), ()
+            if labels and probabilities[0] >= _MODEL_MIN_CONFIDENCE:
+                lang = labels[0].replace("__label__", "", 1)
+                # The model knows far more languages than we can translate
+                if lang in self.language_patterns:
+                    return lang, min(float(probabilities[0]), 1.0)
+
         text_lower = text.lower()
         scores = {}
 
-        for lang, patterns in self.language_patterns.items():
+        for lang, patterns in self._compiled_patterns.items():
             score = 0
             for pattern in patterns:
-                matches = len(re.findall(pattern, text_lower))
+                matches = len(pattern.findall(text_lower))
                 score += matches
 
             if score > 0:
@@ -106,6 +170,10 @@ class LanguageDetector:
         return best_lang, confidence
 
 
+# Punctuation stripped from a word before looking it up
+_NON_WORD = re.compile(r"[^\w]")
+
+
 class SimpleTranslator:
     """Simple translation service using lookup tables for common CLI phrases."""
 
@@ -244,23 +312,32 @@ class SimpleTranslator:
             },
         }
 
+        # The same prompts come up again and again; repeats skip the lookups
+        self._translate = lru_cache(maxsize=1024)(self._translate_words)
+
     def translate_to_english(self, text: str, source_lang: str) -> str:
         """Translate text from source language to English."""
         if source_lang == "en" or source_lang not in self.translations:
             return text
 
-        words = text.lower().split()
+        # The translation is lowercase anyway, so case variants share an entry
+        return self._translate(text.lower(), source_lang)
+
+    def _translate_words(self, text_lower: str, source_lang: str) -> str:
+        """Translate lowercased text word by word."""
+        words = text_lower.split()
         translated_words = []
 
         translation_dict = self.translations[source_lang]
 
         for word in words:
-            # Remove punctuation for lookup
-            clean_word = re.sub(r"[^\w]", "", word)
-            if clean_word in translation_dict:
-                translated_words.append(translation_dict[clean_word])
-            else:
-                translated_words.append(word)  # Keep original if no translation
+            # Dictionary words are punctuation-free, so try the word as is first
+            translation = translation_dict.get(word)
+            if translation is None:
+                # Remove punctuation for lookup
+                clean_word = _NON_WORD.sub("", word)
+                translation = translation_dict.get(clean_word, word)
+            translated_words.append(translation)  # Original if no translation
 
         return " ".join(translated_words)
 
@@ -319,6 +396,38 @@ class MultiLanguageProcessor:
 
         return result
 
+    def process_batch(
+        self,
+        texts: List[str],
+        user_preferred_lang: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, any]]:
+        """
+        Process many inputs, returning one process_input result per text in order.
+
+        Large batches are spread over worker processes (os.cpu_count() by
+        default), each building its own processor from this config; small
+        batches or a single worker run in this process to avoid the overhead.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(texts) < _MIN_PARALLEL_BATCH:
+            return [self.process_input(text, user_preferred_lang) for text in texts]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.config,),
+        ) as pool:
+            return list(
+                pool.map(
+                    partial(
+                        _process_in_worker, user_preferred_lang=user_preferred_lang
+                    ),
+                    texts,
+                    chunksize=max(1, len(texts) // (workers * 4)),
+                )
+            )
+
     def get_response_language(self, user_lang: str) -> str:
         """Get appropriate language for responses."""
         if user_lang in self.config.enabled_languages:
@@ -335,6 +444,26 @@ class MultiLanguageProcessor:
         return text
 
 
+# Below this many texts, process_batch stays serial: starting workers costs more
+_MIN_PARALLEL_BATCH = 32
+
+# Processor owned by a process_batch worker process
+_batch_processor: Optional[MultiLanguageProcessor] = None
+
+
+def _init_batch_worker(config: LanguageConfig) -> None:
+    """Build the worker's processor once, before it handles any text."""
+    global _batch_processor
+    _batch_processor = MultiLanguageProcessor(config)
+
+
+def _process_in_worker(
+    text: str, user_preferred_lang: Optional[str] = None
+) -> Dict[str, any]:
+    """Process one text with the worker's processor."""
+    return _batch_processor.process_input(text, user_preferred_lang)
+
+
 def create_language_processor() -> MultiLanguageProcessor:
     """Create language processor from configuration."""
     config = LanguageConfig()
@@ -349,13 +478,12 @@ def create_language_processor() -> MultiLanguageProcessor:
     return MultiLanguageProcessor(config)
 
 
-# Global processor instance
-_language_processor: Optional[MultiLanguageProcessor] = None
-
-
+@lru_cache(maxsize=1)
 def get_language_processor() -> MultiLanguageProcessor:
-    """Get the global language processor instance."""
-    global _language_processor
-    if _language_processor is None:
-        _language_processor = create_language_processor()
-    return _language_processor
+    """
+    Get the global language processor instance.
+
+    Built on first use; get_language_processor.cache_clear() discards it so
+    the next call picks up a changed environment.
+    """
+    return create_language_processor()
@@ -14,6 +14,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from nlcli import __version__
 from nlcli.context import SessionContext
 from nlcli.engine import create_llm_from_config, explain, plan_and_generate
 from nlcli.executor import execute
@@ -724,12 +725,11 @@ def repl() -> None:
     "--batch-commands", multiple=True, help="Execute multiple commands in batch mode"
 )
 @click.option(
-    "--stop-on-error",
-    is_flag=True,
+    "--stop-on-error/--continue-on-error",
     default=True,
     help="Stop batch execution on first error",
 )
-@click.version_option(version="0.1.3")
+@click.version_option(version=__version__)
 def main(
     dry_run: bool,
     explain: bool,
@@ -4,15 +4,94 @@ Declarative schemas for allowed commands and tools.
 """
 
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from string import Formatter
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
+# Shared by every generator that declares no clauses
+_NO_CLAUSES = MappingProxyType({})
 
-@dataclass
+# Keyword tuples shared between schemas declaring the same keyword set
+_KEYWORD_POOL: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+# Argument name of a format field such as "a.b" or "a[0]"
+_FIELD_ROOT = re.compile(r"[^.\[]*")
+
+
+class CommandTemplate:
+    """
+    A compiled command template such as "ls {flags} {path}".
+
+    The template is turned into a specialized render function, the equivalent
+    of ``lambda values: "ls " + str(values["flags"]) + " " + str(values["path"])``,
+    so rendering skips format-string parsing entirely. Templates using format
+    specs, conversions or attribute/index lookups (``{n:03d}``, ``{x!r}``,
+    ``{a.b}``) render through ``str.format_map`` instead. Use
+    ``CommandTemplate.of`` to share one instance between every schema with the
+    same template.
+    """
+
+    __slots__ = ("template", "fields", "render")
+
+    _pool: Dict[str, "CommandTemplate"] = {}
+
+    def __init__(self, template: str):
+        self.template = template
+
+        terms = []
+        fields = []
+        plain = True
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if literal:
+                terms.append(repr(literal))
+            if field_name is not None:
+                fields.append(_FIELD_ROOT.match(field_name).group())
+                terms.append(f"str(values[{field_name!r}])")
+                if format_spec or conversion or not field_name.isidentifier():
+                    plain = False
+        self.fields: Tuple[str, ...] = tuple(fields)
+
+        if not plain:
+            self.render: Callable[[Dict[str, Any]], str] = template.format_map
+            return
+
+        source = f"def render(values):\n    return {' + '.join(terms) or repr('')}\n"
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, f"<template {template!r}>", "exec"), namespace)
+        self.render = namespace["render"]
+
+    @classmethod
+    def of(cls, template: str) -> "CommandTemplate":
+        """Get the shared compiled instance for a template string."""
+        compiled = cls._pool.get(template)
+        if compiled is None:
+            compiled = cls._pool[template] = cls(template)
+        return compiled
+
+    def __repr__(self) -> str:
+        return f"CommandTemplate({self.template!r})"
+
+
+class ToolCategory(IntEnum):
+    """Origin of a tool schema; built-in tools are grouped by area."""
+
+    FILE = 0
+    PROCESS = 1
+    NETWORK = 2
+    PACKAGE = 3
+    GIT = 4
+    PLUGIN = 5
+
+
+@dataclass(slots=True)
 class ToolArg:
     """Tool argument specification."""
 
@@ -23,6 +102,24 @@ class ToolArg:
     description: str = ""
     validation: Optional[Callable] = None
 
+    def __post_init__(self):
+        # Tools loaded from plugins build these strings at runtime
+        self.name = sys.intern(self.name)
+        self.type = sys.intern(self.type)
+
+
+@dataclass(slots=True, frozen=True)
+class Example:
+    """Natural language example for a tool and the arguments it maps to."""
+
+    nl: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def _word_set(text: str) -> FrozenSet[str]:
+    """Distinct lowercased, interned words of a text."""
+    return frozenset(sys.intern(word) for word in text.lower().split())
+
 
 @dataclass
 class ToolSchema:
@@ -33,14 +130,107 @@ class ToolSchema:
     args: Dict[str, ToolArg]
     generator: Dict[str, Any]  # Command generation template
     danger_level: str = "read_only"  # read_only, modify, destructive
-    examples: List[Dict[str, Any]] = None
-    keywords: List[str] = None
+    examples: Tuple[Example, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    category: ToolCategory = ToolCategory.PLUGIN
+    # Declaration-ordered (name, spec) pairs for loops over every argument
+    arg_items: Tuple[Tuple[str, ToolArg], ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+    _template: Optional[CommandTemplate] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Lowercased words of the summary and of each example, for match scoring
+    summary_words: FrozenSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
+    example_words: Tuple[FrozenSet[str], ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
-        if self.examples is None:
-            self.examples = []
-        if self.keywords is None:
-            self.keywords = []
+        # Plugins may still declare examples as {"nl": ..., "args": ...} dicts
+        self.examples = tuple(
+            (
+                example
+                if isinstance(example, Example)
+                else Example(example["nl"], example.get("args", {}))
+            )
+            for example in self.examples or ()
+            if isinstance(example, Example) or "nl" in example
+        )
+        self.arg_items = tuple(self.args.items())
+        self.name = sys.intern(self.name)
+        self.danger_level = sys.intern(self.danger_level)
+        # Inputs are lowercased before matching, so keywords must be too
+        keywords = tuple(sys.intern(keyword.lower()) for keyword in self.keywords or ())
+        self.keywords = _KEYWORD_POOL.setdefault(tuple(sorted(keywords)), keywords)
+        # Split once here rather than for every tool on every query; interned
+        # so that words repeated across tools are stored once
+        self.summary_words = _word_set(self.summary)
+        self.example_words = tuple(_word_set(example.nl) for example in self.examples)
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """
+        Fill the precompiled command template with the given values.
+
+        Raises KeyError if a placeholder has no value. The template is compiled
+        on first use, so tools that are registered but never run cost nothing.
+        """
+        if self._template is None:
+            cmd = self.generator.get("cmd", "")
+            if not isinstance(cmd, CommandTemplate):
+                cmd = CommandTemplate.of(cmd)
+            self._template = cmd
+        return self._template.render(values)
+
+
+# Tools that _calculate_match_score boosts by name, beyond keyword and word overlap
+_BOOSTED_TOOLS = frozenset(
+    {"search_content", "find_files", "list_files", "kill_process", "process_by_port"}
+)
+
+
+def _has_name_boost(tool: ToolSchema) -> bool:
+    """Whether a tool gets a tool-specific boost when scoring matches."""
+    return (
+        tool.name in _BOOSTED_TOOLS
+        or tool.name.startswith(("apt_", "brew_"))
+        or tool.category is ToolCategory.GIT
+    )
+
+
+# Generated commands remembered per registry, keyed on tool name and arguments
+_COMMAND_CACHE_SIZE = 4096
+
+
+def _command_cache_key(
+    tool_name: str, args: Dict[str, Any]
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Build a hashable cache key for generate_command, or None if an argument
+    value cannot be hashed. Value types are part of the key, so that 1 and
+    True (equal, but rendered differently) never share an entry.
+    """
+    items = []
+    for name, value in args.items():
+        if isinstance(value, list):
+            value = tuple(value)
+        items.append((name, type(value), value))
+    try:
+        return (tool_name, frozenset(items))
+    except TypeError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _builtin_tools() -> Tuple[ToolSchema, ...]:
+    """Collect the built-in tool schemas once per process."""
+    # Import built-in tools
+    from nlcli.tools import load_all
+    from nlcli.tools.file_tools import get_file_tools
+
+    return get_file_tools() + load_all()
 
 
 class ToolRegistry:
@@ -50,17 +240,60 @@ class ToolRegistry:
 
     def __init__(self):
         self.tools: Dict[str, ToolSchema] = {}
+        self._categories: List[Dict[str, ToolSchema]] = [{} for _ in ToolCategory]
+        self._keyword_index: Optional[Dict[str, List[str]]] = None
+        self._word_index: Optional[Dict[str, List[str]]] = None
+        self._command_cache: Dict[Tuple[Any, ...], str] = {}
         self._load_builtin_tools()
         self._load_plugins()
 
     def register_tool(self, schema: ToolSchema) -> None:
         """Register a new tool schema."""
+        previous = self.tools.get(schema.name)
+        if previous is not None:
+            self._categories[previous.category].pop(schema.name, None)
         self.tools[schema.name] = schema
+        self._categories[schema.category][schema.name] = schema
+        self._keyword_index = None
+        self._word_index = None
+        self._command_cache.clear()
+
+    def _get_keyword_index(self) -> Dict[str, List[str]]:
+        """Map each keyword to the names of the tools declaring it."""
+        if self._keyword_index is None:
+            index: Dict[str, List[str]] = {}
+            for tool in self.tools.values():
+                for keyword in tool.keywords:
+                    index.setdefault(keyword, []).append(tool.name)
+            self._keyword_index = index
+        return self._keyword_index
+
+    def _get_word_index(self) -> Dict[str, List[str]]:
+        """
+        Map each word of a tool's summary or examples to the tools using it.
+
+        Tools with tool-specific boosts are listed under "" so that they are
+        always scored: a boost can apply without any indexed word matching.
+        """
+        if self._word_index is None:
+            index: Dict[str, List[str]] = {"": []}
+            for tool in self.tools.values():
+                words = set(tool.summary_words).union(*tool.example_words)
+                if _has_name_boost(tool):
+                    words.add("")
+                for word in words:
+                    index.setdefault(word, []).append(tool.name)
+            self._word_index = index
+        return self._word_index
 
     def get_tool(self, name: str) -> Optional[ToolSchema]:
         """Get tool schema by name."""
         return self.tools.get(name)
 
+    def get_tools_by_category(self, category: ToolCategory) -> List[ToolSchema]:
+        """Get all registered tools in a category."""
+        return list(self._categories[category].values())
+
     def find_matching_tools(self, nl_input: str) -> List[tuple[ToolSchema, float]]:
         """
         Find tools that match the natural language input.
@@ -69,8 +302,29 @@ class ToolRegistry:
         matches = []
         nl_lower = nl_input.lower()
 
+        # Test each distinct keyword once, then credit every tool declaring it
+        keyword_hits: Dict[str, int] = {}
+        for keyword, tool_names in self._get_keyword_index().items():
+            if keyword in nl_lower:
+                for tool_name in tool_names:
+                    keyword_hits[tool_name] = keyword_hits.get(tool_name, 0) + 1
+
+        # Only tools sharing a keyword or word with the input, or whose name
+        # appears in it, can score above zero; the rest are never scored
+        word_index = self._get_word_index()
+        candidates = set(keyword_hits)
+        candidates.update(word_index[""])
+        for word in set(nl_lower.split()):
+            candidates.update(word_index.get(word, ()))
+
         for tool in self.tools.values():
-            score = self._calculate_match_score(tool, nl_lower)
+            if tool.name not in candidates and (
+                tool.name.replace("_", " ") not in nl_lower
+            ):
+                continue
+            score = self._calculate_match_score(
+                tool, nl_lower, keyword_hits.get(tool.name, 0)
+            )
             if score > 0.0:
                 matches.append((tool, score))
 
@@ -78,29 +332,28 @@ class ToolRegistry:
         matches.sort(key=lambda x: x[1], reverse=True)
         return matches
 
-    def _calculate_match_score(self, tool: ToolSchema, nl_input: str) -> float:
+    def _calculate_match_score(
+        self, tool: ToolSchema, nl_input: str, keyword_hits: Optional[int] = None
+    ) -> float:
         """Calculate how well a tool matches the natural language input."""
         score = 0.0
 
         # Keyword matching
-        for keyword in tool.keywords:
-            if keyword in nl_input:
-                score += 0.3
+        if keyword_hits is None:
+            keyword_hits = sum(1 for keyword in tool.keywords if keyword in nl_input)
+        score += 0.3 * keyword_hits
 
         # Summary matching (simple word overlap)
-        summary_words = set(tool.summary.lower().split())
         input_words = set(nl_input.split())
-        overlap = len(summary_words.intersection(input_words))
+        overlap = len(tool.summary_words.intersection(input_words))
         if overlap > 0:
             score += 0.2 * overlap
 
         # Example matching
-        for example in tool.examples:
-            if "nl" in example:
-                example_words = set(example["nl"].lower().split())
-                overlap = len(example_words.intersection(input_words))
-                if overlap > 0:
-                    score += 0.4 * (overlap / len(example_words))
+        for example_words in tool.example_words:
+            overlap = len(example_words.intersection(input_words))
+            if overlap > 0:
+                score += 0.4 * (overlap / len(example_words))
 
         # Tool name matching
         if tool.name.replace("_", " ") in nl_input:
@@ -175,7 +428,7 @@ class ToolRegistry:
                 word in nl_input.lower() for word in ["list", "installed"]
             ):
                 score += 0.5
-        elif tool.name.startswith("git_"):
+        elif tool.category is ToolCategory.GIT:
             # Strong boost for git tools when "git" is explicitly mentioned
             if "git" in nl_input.lower():
                 score += 2.0  # High priority boost for explicit git commands
@@ -248,7 +501,7 @@ class ToolRegistry:
         nl_lower = nl_input.lower()
 
         # Apply heuristics and regex patterns for argument extraction
-        for arg_name, arg_spec in tool.args.items():
+        for arg_name, arg_spec in tool.arg_items:
             value = self._extract_arg_value(arg_name, arg_spec, nl_lower, context)
             if value is not None:
                 args[arg_name] = value
@@ -665,11 +918,27 @@ class ToolRegistry:
 
     def generate_command(self, tool: ToolSchema, args: Dict[str, Any]) -> str:
         """Generate shell command from tool schema and arguments."""
+        # Only registered tools are cached: an ad hoc schema may reuse a name
+        if self.tools.get(tool.name) is not tool:
+            return self._generate_command(tool, args)
+
+        key = _command_cache_key(tool.name, args)
+        if key is None:
+            return self._generate_command(tool, args)
+
+        command = self._command_cache.get(key)
+        if command is None:
+            command = self._generate_command(tool, args)
+            if len(self._command_cache) >= _COMMAND_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del self._command_cache[next(iter(self._command_cache))]
+            self._command_cache[key] = command
+        return command
+
+    def _generate_command(self, tool: ToolSchema, args: Dict[str, Any]) -> str:
+        """Build the command for a tool without consulting the cache."""
         generator = tool.generator
 
-        # Start with base command template
-        cmd_template = generator.get("cmd", "")
-
         # Handle specific tools with custom logic
         if tool.name == "list_files":
             return self._generate_ls_command(args)
@@ -717,36 +986,33 @@ class ToolRegistry:
             return self._generate_git_command(tool.name, args)
 
         # Apply clauses based on arguments for find_files
-        clauses = generator.get("clauses", {})
+        clauses = generator.get("clauses", _NO_CLAUSES)
         clause_replacements = {}
 
         for clause_name, clause_template in clauses.items():
+            # Clauses are filled through the same compiled templates as commands
             if clause_name == "size_clause" and "min_size" in args:
-                clause_replacements[clause_name] = clause_template.format(
-                    min_size=args["min_size"]
-                )
+                clause_replacements[clause_name] = CommandTemplate.of(
+                    clause_template
+                ).render({"min_size": args["min_size"]})
             elif clause_name == "time_clause" and "modified_within" in args:
                 # Convert days format
                 time_val = args["modified_within"]
                 if time_val.endswith("d"):
                     days = time_val[:-1]
-                    clause_replacements[clause_name] = clause_template.format(
-                        modified_within=days
-                    )
+                    clause_replacements[clause_name] = CommandTemplate.of(
+                        clause_template
+                    ).render({"modified_within": days})
             elif clause_name == "name_clause" and "name" in args:
-                clause_replacements[clause_name] = clause_template.format(
-                    name=args["name"]
-                )
+                clause_replacements[clause_name] = CommandTemplate.of(
+                    clause_template
+                ).render({"name": args["name"]})
             else:
                 clause_replacements[clause_name] = ""
 
-        # Replace clauses in template
-        for clause_name, replacement in clause_replacements.items():
-            cmd_template = cmd_template.replace(f"{{{clause_name}}}", replacement)
-
         # Apply default values for missing arguments
         final_args = {}
-        for arg_name, arg_spec in tool.args.items():
+        for arg_name, arg_spec in tool.arg_items:
             if arg_name in args:
                 final_args[arg_name] = args[arg_name]
             elif arg_spec.default is not None:
@@ -756,9 +1022,12 @@ class ToolRegistry:
             else:
                 final_args[arg_name] = ""
 
-        # Format the final command with arguments
+        # Clauses take precedence over arguments of the same name
+        final_args.update(clause_replacements)
+
+        # Fill the precompiled template
         try:
-            return cmd_template.format(**final_args)
+            return tool.render(final_args)
         except KeyError as e:
             # Handle any remaining missing arguments
             raise ValueError(f"Missing required argument: {e}")
@@ -1111,26 +1380,7 @@ class ToolRegistry:
 
     def _load_builtin_tools(self) -> None:
         """Load built-in tool schemas."""
-        # Import built-in tools
-        from nlcli.tools.file_tools import get_file_tools
-        from nlcli.tools.git_tools import get_git_tools
-        from nlcli.tools.network_tools import get_network_tools
-        from nlcli.tools.package_tools import get_package_tools
-        from nlcli.tools.process_tools import get_process_tools
-
-        for tool in get_file_tools():
-            self.register_tool(tool)
-
-        for tool in get_process_tools():
-            self.register_tool(tool)
-
-        for tool in get_network_tools():
-            self.register_tool(tool)
-
-        for tool in get_package_tools():
-            self.register_tool(tool)
-
-        for tool in get_git_tools():
+        for tool in _builtin_tools():
             self.register_tool(tool)
 
     def _load_plugins(self) -> None:
@@ -1157,34 +1407,12 @@ class ToolRegistry:
     def reload_plugins(self) -> None:
         """Reload all plugins."""
         # Remove existing plugin tools
-        plugin_tools = [
-            name
-            for name in self.tools.keys()
-            if "_" in name
-            and not name.startswith(
-                (
-                    "find",
-                    "list",
-                    "search",
-                    "du",
-                    "ps",
-                    "kill",
-                    "top",
-                    "ping",
-                    "curl",
-                    "ss",
-                    "netstat",
-                    "dig",
-                    "wget",
-                    "ip",
-                    "brew",
-                    "apt",
-                    "git",
-                )
-            )
-        ]
-        for tool_name in plugin_tools:
+        for tool_name in self._categories[ToolCategory.PLUGIN]:
             self.tools.pop(tool_name, None)
+        self._categories[ToolCategory.PLUGIN].clear()
+        self._keyword_index = None
+        self._word_index = None
+        self._command_cache.clear()
 
         # Reload plugins
         self._load_plugins()
@@ -317,7 +317,7 @@ def enhanced_safety_check(
         # Import Phase 4 modules (lazy loading)
         from nlcli.enterprise import get_enterprise_manager
         from nlcli.security import audit_command_security
-        from nlcli.telemetry import get_telemetry_manager
+        from nlcli.telemetry import Event, EventType, get_telemetry_manager
 
         # Existing safety check
         is_safe = guard(intent, context)
@@ -371,12 +371,14 @@ def enhanced_safety_check(
         # Record telemetry
         telemetry = get_telemetry_manager()
         telemetry.events.log_event(
-            {
-                "event_type": "security_check",
-                "command": intent.command,
-                "safe": is_safe,
-                "violations": len(violations),
-            }
+            Event(
+                event_type=EventType.SECURITY_CHECK,
+                properties={
+                    "command": intent.command,
+                    "safe": is_safe,
+                    "violations": len(violations),
+                },
+            )
         )
 
         return is_safe, message, violations
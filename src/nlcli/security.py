@@ -7,6 +7,7 @@ and policy enforcement.
 import logging
 import re
 import time
+from bisect import bisect_right
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -95,6 +96,7 @@ class SecurityAuditor:
         self.policy = policy or SecurityPolicy()
         self.logger = logging.getLogger(f"{__name__}.SecurityAuditor")
         self.violation_history: List[SecurityViolation] = []
+        self._build_blocked_index()
 
         # Enhanced dangerous patterns with severity levels
         self.vulnerability_patterns = {
@@ -199,12 +201,17 @@ class SecurityAuditor:
         """Audit file paths in command for security violations."""
         violations = []
 
+        # Path-free commands (ls, pwd, ...) are the common case
+        if "/" not in command and "~" not in command:
+            return violations
+
         # Extract file paths
         path_patterns = [
             r"(?:^|\s)(/[^\s]*)",  # Absolute paths
             r"(?:^|\s)(~[^\s]*)",  # Home directory paths
-            r"(?:^|\s)(\./[^\s]*)",  # Relative paths
         ]
+        if "./" in command:
+            path_patterns.append(r"(?:^|\s)(\./[^\s]*)")  # Relative paths
 
         paths = set()
         for pattern in path_patterns:
@@ -216,18 +223,17 @@ class SecurityAuditor:
                 path = Path(path_str).resolve()
 
                 # Check for blocked directories
-                for blocked in self.policy.blocked_directories:
-                    if str(path).startswith(blocked):
-                        violations.append(
-                            SecurityViolation(
-                                violation_type=VulnerabilityType.PATH_TRAVERSAL,
-                                severity=SecurityLevel.HIGH,
-                                description=f"Access to blocked directory: {blocked}",
-                                command=command,
-                                recommendation="Use allowed directories only",
-                                timestamp=time.time(),
-                            )
+                for blocked in self._match_blocked_prefixes(str(path)):
+                    violations.append(
+                        SecurityViolation(
+                            violation_type=VulnerabilityType.PATH_TRAVERSAL,
+                            severity=SecurityLevel.HIGH,
+                            description=f"Access to blocked directory: {blocked}",
+                            command=command,
+                            recommendation="Use allowed directories only",
+                            timestamp=time.time(),
                         )
+                    )
 
             except Exception:
                 # Path resolution failed - treat as suspicious
@@ -244,6 +250,39 @@ class SecurityAuditor:
 
         return violations
 
+    def _build_blocked_index(self) -> None:
+        """Precompute the sorted blocked-directory prefixes used for lookups.
+
+        Each prefix also records the index of its longest blocked ancestor
+        (another blocked prefix it starts with), or -1 if it has none.
+        """
+        prefixes = tuple(sorted(self.policy.blocked_directories))
+        parents = []
+        for i, prefix in enumerate(prefixes):
+            parent = -1
+            for j in range(i - 1, -1, -1):
+                if prefix.startswith(prefixes[j]):
+                    parent = j
+                    break
+            parents.append(parent)
+
+        self._blocked_prefixes = prefixes
+        self._blocked_parents = tuple(parents)
+
+    def _match_blocked_prefixes(self, path: str) -> List[str]:
+        """Return every blocked directory prefix that ``path`` starts with."""
+        # Any blocked prefix of ``path`` sorts between itself and ``path``, so
+        # it is also a prefix of the bisect candidate and lies on its ancestor
+        # chain.
+        matches = []
+        i = bisect_right(self._blocked_prefixes, path) - 1
+        while i >= 0:
+            prefix = self._blocked_prefixes[i]
+            if path.startswith(prefix):
+                matches.append(prefix)
+            i = self._blocked_parents[i]
+        return matches
+
     def _get_recommendation(self, vuln_type: VulnerabilityType) -> str:
         """Get security recommendation for vulnerability type."""
         recommendations = {
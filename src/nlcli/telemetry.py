@@ -6,15 +6,36 @@ Implements comprehensive observability, logging, and analytics.
 import json
 import logging
 import logging.handlers
+import math
+import os
+import queue
 import sys
 import threading
 import time
 import uuid
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import partial
+from itertools import accumulate, chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Queued behind the last event to stop an EventLogger's writer thread
+_STOP_WRITER = object()
+
+# Read-only tags shared by every metric recorded without tags
+_EMPTY_TAGS: Mapping[str, str] = MappingProxyType({})
 
 
 class MetricType(Enum):
@@ -37,6 +58,7 @@ class EventType(Enum):
     ERROR_OCCURRED = "error_occurred"
     USER_SESSION_START = "user_session_start"
     USER_SESSION_END = "user_session_end"
+    SECURITY_CHECK = "security_check"
     SECURITY_VIOLATION = "security_violation"
     PERFORMANCE_WARNING = "performance_warning"
     TOOL_MATCHED = "tool_matched"
@@ -44,7 +66,7 @@ class EventType(Enum):
     CACHE_MISS = "cache_miss"
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricPoint:
     """A single metric data point."""
 
@@ -52,11 +74,11 @@ class MetricPoint:
     value: Union[int, float]
     metric_type: MetricType
     timestamp: float = field(default_factory=time.time)
-    tags: Dict[str, str] = field(default_factory=dict)
+    tags: Mapping[str, str] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """An event to be logged."""
 
@@ -68,7 +90,7 @@ class Event:
     context: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionInfo:
     """Information about a user session."""
 
@@ -83,43 +105,266 @@ class SessionInfo:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class FixedWidthHistogram:
+    """Bounded-memory histogram over log-spaced buckets.
+
+    Observations are counted into ``bucket_count`` buckets spanning
+    ``[lowest, highest]``; values outside the range land in the first or last
+    bucket. Memory stays constant however many values are recorded. Count,
+    min, max and total are exact, percentiles are accurate to one bucket.
+    """
+
+    def __init__(
+        self, lowest: float = 1e-6, highest: float = 1e3, bucket_count: int = 1000
+    ):
+        self.lowest = lowest
+        self.highest = highest
+        self.bucket_count = bucket_count
+        self.buckets = array("q", bytes(8 * bucket_count))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        self._log_lowest = math.log(lowest)
+        self._log_width = (math.log(highest) - self._log_lowest) / bucket_count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, value: float) -> None:
+        """Count a single observation."""
+        if value <= self.lowest:
+            index = 0
+        elif value >= self.highest:
+            index = self.bucket_count - 1
+        else:
+            index = min(
+                int((math.log(value) - self._log_lowest) / self._log_width),
+                self.bucket_count - 1,
+            )
+
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentiles(self, percentiles: Tuple[float, ...]) -> List[float]:
+        """Estimate several percentiles from the cumulative bucket counts."""
+        if not self.count:
+            return [0.0] * len(percentiles)
+
+        # Cumulative counts are built and searched in C rather than walking
+        # the buckets in a Python loop
+        cumulative = list(accumulate(self.buckets))
+        return [
+            self._bucket_value(
+                bisect_right(cumulative, min(int(self.count * p / 100), self.count - 1))
+            )
+            for p in percentiles
+        ]
+
+    def _bucket_value(self, index: int) -> float:
+        """Upper edge of a bucket, clamped to the observed range."""
+        if index == self.bucket_count - 1:
+            # The last bucket also holds every overflowing value
+            return self.max
+        upper = math.exp(self._log_lowest + (index + 1) * self._log_width)
+        return min(max(upper, self.min), self.max)
+
+
+def _copy_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached summary so callers can never modify the cache."""
+    return {
+        key: _copy_summary(value) if isinstance(value, dict) else value
+        for key, value in summary.items()
+    }
+
+
+def _dumps_json(data: Dict[str, Any]) -> str:
+    """Serialize a log record, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # e.g. integers too large for orjson; the stdlib encoder copes
+            pass
+    return json.dumps(data, default=str)
+
+
+class RingBuffer:
+    """Fixed-capacity buffer backed by a plain list.
+
+    Once full, each append overwrites the oldest item. Unlike a deque, any
+    position can be indexed in O(1), which keeps bisecting over it cheap.
+    Not thread-safe; callers serialize access.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._items: List[Any] = []
+        self._start = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> Any:
+        count = len(self._items)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self.maxlen]
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain(self._items[self._start :], self._items[: self._start])
+
+    def append(self, item: Any) -> None:
+        """Append an item, overwriting the oldest one when full."""
+        if len(self._items) < self.maxlen:
+            self._items.append(item)
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.maxlen
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._items = []
+        self._start = 0
+
+
+class _ThreadToken:
+    """Per-thread object whose collection signals that the thread has ended."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _retire_counter_shard(
+    collector_ref: "weakref.ReferenceType[MetricsCollector]", shard: Dict[str, int]
+) -> None:
+    """Fold an ended thread's counter shard into the collector's totals."""
+    collector = collector_ref()
+    if collector is not None:
+        collector._retire_counter_shard(shard)
+
+
 class MetricsCollector:
     """Collects and manages metrics."""
 
-    def __init__(self, max_metrics: int = 100000):
+    def __init__(self, max_metrics: int = 100000, retain_raw: bool = False):
         self.max_metrics = max_metrics
+        # Summaries only need the aggregates below, so individual points are
+        # only kept in ``metrics`` when raw retention is requested
+        self.retain_raw = retain_raw
         self.metrics: deque = deque(maxlen=max_metrics)
+        # Untagged counter increments are kept as (name, value, timestamp)
+        # tuples and only turned into MetricPoints when a summary is taken
+        self._raw_counters: deque = deque(maxlen=max_metrics)
         self._lock = threading.RLock()
         self.logger = logging.getLogger(f"{__name__}.MetricsCollector")
 
-        # Aggregated metrics
-        self.counters: Dict[str, int] = defaultdict(int)
+        # Aggregated metrics. Counters are split into per-thread shards that
+        # only their owning thread writes, so incrementing needs no lock;
+        # ``counters`` sums the shards on read. When a thread ends, its shard
+        # is folded into the retired totals so shards don't pile up.
+        self._counter_shards: List[Dict[str, int]] = []
+        self._retired_counters: Dict[str, int] = defaultdict(int)
+        self._local = threading.local()
         self.gauges: Dict[str, float] = {}
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
-        self.timers: Dict[str, List[float]] = defaultdict(list)
+        self.histograms: Dict[str, FixedWidthHistogram] = defaultdict(
+            partial(FixedWidthHistogram, lowest=1e-3, highest=1e9)
+        )
+        self.timers: Dict[str, FixedWidthHistogram] = defaultdict(FixedWidthHistogram)
+
+        # Last summary, reused until the next metric is recorded. Writers set
+        # the stale flag after updating, readers clear it before reading.
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._summary_stale = True
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Snapshot of counter totals across all threads."""
+        with self._lock:
+            totals = defaultdict(int, self._retired_counters)
+            for shard in self._counter_shards:
+                for name, value in list(shard.items()):
+                    totals[name] += value
+        return totals
 
     def record_metric(self, metric: MetricPoint) -> None:
         """Record a metric point."""
-        with self._lock:
+        # deque.append and a single dict store are atomic under the GIL, so
+        # only the multi-field histogram/timer updates need the lock
+        if self.retain_raw:
             self.metrics.append(metric)
 
-            # Update aggregated metrics
-            if metric.metric_type == MetricType.COUNTER:
-                self.counters[metric.name] += metric.value
-            elif metric.metric_type == MetricType.GAUGE:
-                self.gauges[metric.name] = metric.value
-            elif metric.metric_type == MetricType.HISTOGRAM:
-                self.histograms[metric.name].append(metric.value)
+        if metric.metric_type == MetricType.COUNTER:
+            self._add_to_counter(metric.name, metric.value)
+            return
+        if metric.metric_type == MetricType.GAUGE:
+            self.gauges[metric.name] = metric.value
+            self._summary_stale = True
+            return
+
+        with self._lock:
+            if metric.metric_type == MetricType.HISTOGRAM:
+                self.histograms[metric.name].record(metric.value)
             elif metric.metric_type == MetricType.TIMER:
-                self.timers[metric.name].append(metric.value)
+                self.timers[metric.name].record(metric.value)
+
+            self._summary_stale = True
+
+    def _add_to_counter(self, name: str, value: int) -> None:
+        """Add to a counter in the calling thread's shard."""
+        shard = getattr(self._local, "counters", None)
+        if shard is None:
+            shard = {}
+            # The thread-local token is released when the thread ends
+            token = _ThreadToken()
+            weakref.finalize(
+                token, _retire_counter_shard, weakref.ref(self), shard
+            ).atexit = False
+            with self._lock:
+                self._local.counters = shard
+                self._local.token = token
+                self._counter_shards.append(shard)
+
+        current = shard.get(name)
+        if current is None:
+            # Intern new names so later lookups hit the identity fast path
+            shard[sys.intern(name)] = value
+        else:
+            shard[name] = current + value
+        self._summary_stale = True
+
+    def _retire_counter_shard(self, shard: Dict[str, int]) -> None:
+        """Move an ended thread's shard into the retired counter totals."""
+        with self._lock:
+            for index, live in enumerate(self._counter_shards):
+                if live is shard:
+                    del self._counter_shards[index]
+                    for name, value in shard.items():
+                        self._retired_counters[name] += value
+                    break
 
     def increment_counter(
         self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Increment a counter metric."""
+        if tags is None:
+            if self.retain_raw:
+                self._raw_counters.append((name, value, time.time()))
+            self._add_to_counter(name, value)
+            return
+
         self.record_metric(
             MetricPoint(
-                name=name, value=value, metric_type=MetricType.COUNTER, tags=tags or {}
+                name=name, value=value, metric_type=MetricType.COUNTER, tags=tags
             )
         )
 
@@ -129,7 +374,10 @@ class MetricsCollector:
         """Set a gauge metric."""
         self.record_metric(
             MetricPoint(
-                name=name, value=value, metric_type=MetricType.GAUGE, tags=tags or {}
+                name=name,
+                value=value,
+                metric_type=MetricType.GAUGE,
+                tags=_EMPTY_TAGS if tags is None else tags,
             )
         )
 
@@ -142,7 +390,7 @@ class MetricsCollector:
                 name=name,
                 value=value,
                 metric_type=MetricType.HISTOGRAM,
-                tags=tags or {},
+                tags=_EMPTY_TAGS if tags is None else tags,
             )
         )
 
@@ -152,79 +400,131 @@ class MetricsCollector:
         """Record a timer metric."""
         self.record_metric(
             MetricPoint(
-                name=name, value=duration, metric_type=MetricType.TIMER, tags=tags or {}
+                name=name,
+                value=duration,
+                metric_type=MetricType.TIMER,
+                tags=_EMPTY_TAGS if tags is None else tags,
             )
         )
 
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of all metrics."""
         with self._lock:
+            if not self._summary_stale and self._summary_cache is not None:
+                return _copy_summary(self._summary_cache)
+            self._summary_stale = False
+            counters = self.counters
+            if self.retain_raw:
+                self._materialize_raw_counters()
+                total_metrics = len(self.metrics)
+            else:
+                total_metrics = (
+                    sum(counters.values())
+                    + len(self.gauges)
+                    + sum(h.count for h in self.histograms.values())
+                    + sum(t.count for t in self.timers.values())
+                )
+
             summary = {
-                "total_metrics": len(self.metrics),
-                "counters": dict(self.counters),
+                "total_metrics": total_metrics,
+                "counters": dict(counters),
                 "gauges": dict(self.gauges),
                 "histograms": {},
                 "timers": {},
             }
 
             # Calculate histogram statistics
-            for name, values in self.histograms.items():
-                if values:
+            for name, histogram in self.histograms.items():
+                if histogram.count:
+                    p95, p99 = histogram.percentiles((95, 99))
                     summary["histograms"][name] = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values),
-                        "p95": self._percentile(values, 95),
-                        "p99": self._percentile(values, 99),
+                        "count": histogram.count,
+                        "min": histogram.min,
+                        "max": histogram.max,
+                        "avg": histogram.total / histogram.count,
+                        "p95": p95,
+                        "p99": p99,
                     }
 
             # Calculate timer statistics
-            for name, durations in self.timers.items():
-                if durations:
+            for name, timer in self.timers.items():
+                if timer.count:
+                    p95, p99 = timer.percentiles((95, 99))
                     summary["timers"][name] = {
-                        "count": len(durations),
-                        "min_seconds": min(durations),
-                        "max_seconds": max(durations),
-                        "avg_seconds": sum(durations) / len(durations),
-                        "p95_seconds": self._percentile(durations, 95),
-                        "p99_seconds": self._percentile(durations, 99),
-                        "total_seconds": sum(durations),
+                        "count": timer.count,
+                        "min_seconds": timer.min,
+                        "max_seconds": timer.max,
+                        "avg_seconds": timer.total / timer.count,
+                        "p95_seconds": p95,
+                        "p99_seconds": p99,
+                        "total_seconds": timer.total,
                     }
 
-            return summary
-
-    def _percentile(self, values: List[float], percentile: float) -> float:
-        """Calculate percentile value."""
-        if not values:
-            return 0.0
-
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile / 100)
-        return sorted_values[min(index, len(sorted_values) - 1)]
+            self._summary_cache = summary
+            return _copy_summary(summary)
+
+    def _materialize_raw_counters(self) -> None:
+        """Move buffered counter increments into ``metrics`` as MetricPoints."""
+        raw_counters = self._raw_counters
+        while raw_counters:
+            name, value, timestamp = raw_counters.popleft()
+            self.metrics.append(
+                MetricPoint(
+                    name=name,
+                    value=value,
+                    metric_type=MetricType.COUNTER,
+                    timestamp=timestamp,
+                    tags=_EMPTY_TAGS,
+                )
+            )
 
     def clear_metrics(self) -> None:
         """Clear all metrics."""
         with self._lock:
             self.metrics.clear()
-            self.counters.clear()
+            self._raw_counters.clear()
+            self._counter_shards = []
+            self._retired_counters.clear()
+            self._local = threading.local()
             self.gauges.clear()
             self.histograms.clear()
             self.timers.clear()
+            self._summary_stale = True
 
 
 class EventLogger:
     """Logs events for analytics and monitoring."""
 
     def __init__(self, log_file: Optional[Path] = None):
-        self.events: deque = deque(maxlen=50000)
+        self.events = RingBuffer(maxlen=50000)
+        # Parallel, append-ordered timestamps so summaries can bisect to the
+        # start of their window instead of scanning every event. Like every
+        # stored timestamp these are wall-clock times; a backwards clock step
+        # only shifts the window edge by the size of the step
+        self._event_timestamps = RingBuffer(maxlen=50000)
         self._lock = threading.RLock()
         self.logger = logging.getLogger(f"{__name__}.EventLogger")
 
+        # Last summary as (version, hours, valid_until_cutoff, summary); it
+        # stays valid until a new event is logged or its oldest event ages out
+        self._version = 0
+        self._summary_cache: Optional[Tuple[int, int, float, Dict[str, Any]]] = None
+
+        # Running aggregates over the events in the current summary window,
+        # i.e. event sequence numbers [_window_start, _version). Logging adds
+        # to them; summaries slide the window start to the requested cutoff.
+        self._window_start = 0
+        self._window_by_type: Dict[str, int] = defaultdict(int)
+        self._window_by_session: Dict[str, int] = defaultdict(int)
+        self._window_commands = {"total": 0, "successful": 0, "failed": 0}
+        self._window_duration_total = 0.0
+        self._window_duration_count = 0
+
         # Setup structured event logging
+        self.dropped_events = 0
         if log_file:
             self.event_file_handler = logging.handlers.RotatingFileHandler(
-                log_file, maxBytes=10 * 1024 * 1024, backupCount=5
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, delay=True
             )
             self.event_file_handler.setFormatter(logging.Formatter("%(message)s"))
 
@@ -232,25 +532,159 @@ class EventLogger:
             self.event_logger = logging.getLogger(f"{__name__}.events")
             self.event_logger.addHandler(self.event_file_handler)
             self.event_logger.setLevel(logging.INFO)
+
+            # Events are serialized and written by a background thread so
+            # log_event never waits on disk I/O. The thread holds no reference
+            # to the logger, so the finalizer can drain and stop it when the
+            # logger is closed, garbage collected, or the interpreter exits.
+            self._write_queue: queue.Queue = queue.Queue(maxsize=10000)
+            self._writer_thread = threading.Thread(
+                target=self._write_events,
+                args=(self._write_queue, self.event_logger, self.logger),
+                name="nlcli-event-writer",
+                daemon=True,
+            )
+            self._writer_thread.start()
+            self._finalizer = weakref.finalize(
+                self,
+                self._stop_writer,
+                self._write_queue,
+                self._writer_thread,
+                self.event_logger,
+                self.event_file_handler,
+            )
         else:
             self.event_logger = None
 
     def log_event(self, event: Event) -> None:
         """Log an event."""
         with self._lock:
+            if len(self.events) == self.events.maxlen:
+                # The oldest event is about to be overwritten
+                dropped = self._version - len(self.events)
+                if dropped >= self._window_start:
+                    self._aggregate_event(self.events[0], -1)
+                    self._window_start = dropped + 1
+
             self.events.append(event)
+            self._event_timestamps.append(event.timestamp)
+            self._aggregate_event(event, 1)
+            self._version += 1
+
+        # Hand off to the file writer if configured
+        if self.event_logger:
+            try:
+                self._write_queue.put_nowait(event)
+            except queue.Full:
+                self.dropped_events += 1
+
+    @staticmethod
+    def _write_events(
+        write_queue: queue.Queue,
+        event_logger: logging.Logger,
+        error_logger: logging.Logger,
+    ) -> None:
+        """Background loop writing queued events to the event log in batches."""
+        stopping = False
+        while not stopping:
+            batch = []
+            while len(batch) < 100:
+                try:
+                    # Block for the first event of a batch only
+                    item = write_queue.get(block=not batch)
+                except queue.Empty:
+                    break
+                if item is _STOP_WRITER:
+                    write_queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            lines = []
+            for event in batch:
+                try:
+                    lines.append(_dumps_json(EventLogger._event_to_dict(event)))
+                except (TypeError, ValueError) as e:
+                    error_logger.error(f"Failed to serialize event: {e}")
+            try:
+                if lines:
+                    event_logger.info("\n".join(lines))
+            except Exception as e:
+                error_logger.error(f"Failed to write events: {e}")
+            finally:
+                for _ in batch:
+                    write_queue.task_done()
+
+    @staticmethod
+    def _stop_writer(
+        write_queue: queue.Queue,
+        writer_thread: threading.Thread,
+        event_logger: logging.Logger,
+        handler: logging.Handler,
+    ) -> None:
+        """Write out queued events, stop the writer and release the log file."""
+        write_queue.put(_STOP_WRITER)
+        if writer_thread is not threading.current_thread():
+            writer_thread.join()
+        event_logger.removeHandler(handler)
+        handler.close()
+
+    @staticmethod
+    def _event_to_dict(event: Event) -> Dict[str, Any]:
+        """Build the JSON-serializable record for an event."""
+        return {
+            "timestamp": event.timestamp,
+            "event_type": event.event_type.value,
+            "session_id": event.session_id,
+            "user_id": event.user_id,
+            "properties": event.properties,
+            "context": event.context,
+        }
+
+    def flush(self) -> None:
+        """Block until all queued events have been written to the event log."""
+        if self.event_logger:
+            self._write_queue.join()
+
+    def close(self) -> None:
+        """Write out queued events and stop writing to the event log."""
+        if self.event_logger:
+            self._finalizer()
+            self.event_logger = None
 
-            # Log to file if configured
-            if self.event_logger:
-                event_data = {
-                    "timestamp": event.timestamp,
-                    "event_type": event.event_type.value,
-                    "session_id": event.session_id,
-                    "user_id": event.user_id,
-                    "properties": event.properties,
-                    "context": event.context,
-                }
-                self.event_logger.info(json.dumps(event_data, default=str))
+    def _aggregate_event(self, event: Event, sign: int) -> None:
+        """Add an event to (sign=1) or remove it from (sign=-1) the window."""
+        event_type = event.event_type.value
+        self._window_by_type[event_type] += sign
+        if not self._window_by_type[event_type]:
+            del self._window_by_type[event_type]
+
+        if event.session_id:
+            self._window_by_session[event.session_id] += sign
+            if not self._window_by_session[event.session_id]:
+                del self._window_by_session[event.session_id]
+
+        if event.event_type == EventType.COMMAND_EXECUTED:
+            self._window_commands["total"] += sign
+            if event.properties.get("success"):
+                self._window_commands["successful"] += sign
+            else:
+                self._window_commands["failed"] += sign
+
+            duration = event.properties.get("duration_seconds", 0)
+            if duration:
+                self._window_duration_total += sign * duration
+                self._window_duration_count += sign
+
+    def _move_window_start(self, start: int) -> None:
+        """Slide the aggregated window to begin at event sequence ``start``."""
+        first = self._version - len(self.events)
+        while self._window_start < start:
+            self._aggregate_event(self.events[self._window_start - first], -1)
+            self._window_start += 1
+        while self._window_start > start:
+            self._window_start -= 1
+            self._aggregate_event(self.events[self._window_start - first], 1)
 
     def log_command_execution(
         self,
@@ -317,50 +751,38 @@ class EventLogger:
 
     def get_events_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get summary of recent events."""
-        cutoff_time = time.time() - (hours * 3600)
+        cutoff_time = time.time() - hours * 3600
 
         with self._lock:
-            recent_events = [e for e in self.events if e.timestamp >= cutoff_time]
-
-            if not recent_events:
-                return {"total_events": 0, "period_hours": hours}
-
-            # Analyze events
-            by_type = defaultdict(int)
-            by_session = defaultdict(int)
-            command_stats = {
-                "total": 0,
-                "successful": 0,
-                "failed": 0,
-                "avg_duration": 0,
-            }
-
-            durations = []
-
-            for event in recent_events:
-                by_type[event.event_type.value] += 1
-
-                if event.session_id:
-                    by_session[event.session_id] += 1
-
-                if event.event_type == EventType.COMMAND_EXECUTED:
-                    command_stats["total"] += 1
-                    if event.properties.get("success"):
-                        command_stats["successful"] += 1
-                    else:
-                        command_stats["failed"] += 1
-
-                    duration = event.properties.get("duration_seconds", 0)
-                    if duration:
-                        durations.append(duration)
-
-            if durations:
-                command_stats["avg_duration"] = sum(durations) / len(durations)
+            cached = self._summary_cache
+            if (
+                cached is not None
+                and cached[0] == self._version
+                and cached[1] == hours
+                and cutoff_time <= cached[2]
+            ):
+                return _copy_summary(cached[3])
+
+            start = bisect_left(self._event_timestamps, cutoff_time)
+            self._move_window_start(self._version - len(self.events) + start)
+            total_events = len(self.events) - start
+
+            if not total_events:
+                summary = {"total_events": 0, "period_hours": hours}
+                self._summary_cache = (self._version, hours, math.inf, summary)
+                return _copy_summary(summary)
+
+            command_stats = dict(self._window_commands, avg_duration=0)
+            if self._window_duration_count:
+                command_stats["avg_duration"] = (
+                    self._window_duration_total / self._window_duration_count
+                )
 
-            return {
-                "total_events": len(recent_events),
+            by_session = self._window_by_session
+            summary = {
+                "total_events": total_events,
                 "period_hours": hours,
-                "by_type": dict(by_type),
+                "by_type": dict(self._window_by_type),
                 "unique_sessions": len(by_session),
                 "command_stats": command_stats,
                 "most_active_session": (
@@ -370,21 +792,57 @@ class EventLogger:
                 ),
             }
 
+            oldest = self._event_timestamps[start]
+            self._summary_cache = (self._version, hours, oldest, summary)
+            return _copy_summary(summary)
+
 
 class SessionManager:
     """Manages user sessions for analytics."""
 
+    SHARD_COUNT = 16
+
     def __init__(self):
-        self.sessions: Dict[str, SessionInfo] = {}
-        self._lock = threading.RLock()
+        # Sessions are spread over independently locked shards so that
+        # updates to different sessions do not contend on one lock
+        self._shards: List[Dict[str, SessionInfo]] = [
+            {} for _ in range(self.SHARD_COUNT)
+        ]
+        self._shard_locks: List[threading.RLock] = [
+            threading.RLock() for _ in range(self.SHARD_COUNT)
+        ]
         self.logger = logging.getLogger(f"{__name__}.SessionManager")
 
+        # Number of sessions that used each plugin, kept up to date as
+        # sessions record plugins
+        self._plugin_usage: Dict[str, int] = defaultdict(int)
+        self._plugin_usage_lock = threading.Lock()
+
+    @property
+    def sessions(self) -> Dict[str, SessionInfo]:
+        """Snapshot of all sessions keyed by session ID."""
+        return {session.session_id: session for session in self._all_sessions()}
+
+    def _shard(self, session_id: str) -> Tuple[Dict[str, SessionInfo], threading.RLock]:
+        """Return the shard and lock holding a session ID."""
+        index = hash(session_id) & (self.SHARD_COUNT - 1)
+        return self._shards[index], self._shard_locks[index]
+
+    def _all_sessions(self) -> List[SessionInfo]:
+        """Collect sessions from every shard, locking one shard at a time."""
+        sessions = []
+        for shard, lock in zip(self._shards, self._shard_locks):
+            with lock:
+                sessions.extend(shard.values())
+        return sessions
+
     def start_session(self, user_agent: Optional[str] = None) -> str:
         """Start a new session."""
         session_id = str(uuid.uuid4())
 
-        with self._lock:
-            self.sessions[session_id] = SessionInfo(
+        shard, lock = self._shard(session_id)
+        with lock:
+            shard[session_id] = SessionInfo(
                 session_id=session_id, start_time=time.time(), user_agent=user_agent
             )
 
@@ -393,80 +851,104 @@ class SessionManager:
 
     def end_session(self, session_id: str) -> None:
         """End a session."""
-        with self._lock:
-            if session_id in self.sessions:
-                self.sessions[session_id].end_time = time.time()
+        shard, lock = self._shard(session_id)
+        with lock:
+            if session_id in shard:
+                shard[session_id].end_time = time.time()
                 self.logger.info(f"Ended session: {session_id}")
 
     def update_session(self, session_id: str, **updates) -> None:
         """Update session information."""
-        with self._lock:
-            if session_id in self.sessions:
-                session = self.sessions[session_id]
+        shard, lock = self._shard(session_id)
+        with lock:
+            if session_id in shard:
+                session = shard[session_id]
                 for key, value in updates.items():
                     if hasattr(session, key):
                         if key == "plugins_used" and isinstance(value, str):
-                            session.plugins_used.add(value)
+                            if value not in session.plugins_used:
+                                session.plugins_used.add(value)
+                                self._count_plugin_usage({value}, set())
+                        elif key == "plugins_used":
+                            value = set(value)
+                            self._count_plugin_usage(
+                                value - session.plugins_used,
+                                session.plugins_used - value,
+                            )
+                            session.plugins_used = value
                         else:
                             setattr(session, key, value)
 
+    def _count_plugin_usage(self, added: Set[str], removed: Set[str]) -> None:
+        """Apply a session's plugin additions and removals to the usage totals."""
+        if not added and not removed:
+            return
+        with self._plugin_usage_lock:
+            for plugin in added:
+                self._plugin_usage[plugin] += 1
+            for plugin in removed:
+                self._plugin_usage[plugin] -= 1
+                if not self._plugin_usage[plugin]:
+                    del self._plugin_usage[plugin]
+
+    def increment_session_counter(
+        self, session_id: str, field_name: str, delta: int = 1
+    ) -> None:
+        """Atomically add ``delta`` to a numeric session field."""
+        shard, lock = self._shard(session_id)
+        with lock:
+            session = shard.get(session_id)
+            if session is not None:
+                setattr(session, field_name, getattr(session, field_name) + delta)
+
     def get_session(self, session_id: str) -> Optional[SessionInfo]:
         """Get session information."""
-        with self._lock:
-            return self.sessions.get(session_id)
+        shard, lock = self._shard(session_id)
+        with lock:
+            return shard.get(session_id)
 
     def get_active_sessions(self) -> List[SessionInfo]:
         """Get list of active sessions."""
-        with self._lock:
-            return [
-                session
-                for session in self.sessions.values()
-                if session.end_time is None
-            ]
+        return [session for session in self._all_sessions() if session.end_time is None]
 
     def get_session_analytics(self) -> Dict[str, Any]:
         """Get session analytics."""
-        with self._lock:
-            if not self.sessions:
-                return {"total_sessions": 0}
-
-            active_sessions = len(
-                [s for s in self.sessions.values() if s.end_time is None]
-            )
-            total_sessions = len(self.sessions)
-
-            # Calculate session durations
-            durations = []
-            for session in self.sessions.values():
-                if session.end_time:
-                    durations.append(session.end_time - session.start_time)
-
-            avg_duration = sum(durations) / len(durations) if durations else 0
-
-            # Commands per session
-            commands_per_session = [s.commands_executed for s in self.sessions.values()]
-            avg_commands = (
-                sum(commands_per_session) / len(commands_per_session)
-                if commands_per_session
-                else 0
-            )
+        sessions = self._all_sessions()
+        if not sessions:
+            return {"total_sessions": 0}
+
+        active_sessions = len([s for s in sessions if s.end_time is None])
+        total_sessions = len(sessions)
+
+        # Calculate session durations
+        durations = []
+        for session in sessions:
+            if session.end_time:
+                durations.append(session.end_time - session.start_time)
+
+        avg_duration = sum(durations) / len(durations) if durations else 0
+
+        # Commands per session
+        commands_per_session = [s.commands_executed for s in sessions]
+        avg_commands = (
+            sum(commands_per_session) / len(commands_per_session)
+            if commands_per_session
+            else 0
+        )
 
-            return {
-                "total_sessions": total_sessions,
-                "active_sessions": active_sessions,
-                "avg_session_duration_seconds": avg_duration,
-                "avg_commands_per_session": avg_commands,
-                "total_commands": sum(commands_per_session),
-                "most_used_plugins": self._get_plugin_usage_stats(),
-            }
+        return {
+            "total_sessions": total_sessions,
+            "active_sessions": active_sessions,
+            "avg_session_duration_seconds": avg_duration,
+            "avg_commands_per_session": avg_commands,
+            "total_commands": sum(commands_per_session),
+            "most_used_plugins": self._get_plugin_usage_stats(),
+        }
 
     def _get_plugin_usage_stats(self) -> Dict[str, int]:
         """Get plugin usage statistics."""
-        plugin_counts = defaultdict(int)
-        for session in self.sessions.values():
-            for plugin in session.plugins_used:
-                plugin_counts[plugin] += 1
-        return dict(plugin_counts)
+        with self._plugin_usage_lock:
+            return dict(self._plugin_usage)
 
 
 class TelemetryManager:
@@ -487,6 +969,12 @@ class TelemetryManager:
 
         self.sessions = SessionManager()
 
+        # Bound once so record_command_execution skips the attribute chains
+        self._increment_counter = self.metrics.increment_counter
+        self._record_timer = self.metrics.record_timer
+        self._log_command = self.events.log_command_execution
+        self._increment_session_counter = self.sessions.increment_session_counter
+
         # Current session
         self.current_session_id: Optional[str] = None
 
@@ -498,24 +986,30 @@ class TelemetryManager:
         log_level = self.config.get("log_level", "INFO")
         log_file = self.config.get("log_file")
 
-        # Configure root logger
-        logging.basicConfig(
-            level=getattr(logging, log_level),
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[logging.StreamHandler(sys.stdout)],
-        )
+        # Configure root logger unless the application already has
+        root_logger = logging.getLogger()
+        if not root_logger.handlers:
+            logging.basicConfig(
+                level=getattr(logging, log_level),
+                format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                handlers=[logging.StreamHandler(sys.stdout)],
+            )
 
-        # Add file handler if specified
-        if log_file:
+        # Add file handler if specified and not already attached. The file
+        # is only opened when the first record is written.
+        if log_file and not any(
+            getattr(handler, "baseFilename", None) == os.path.abspath(log_file)
+            for handler in root_logger.handlers
+        ):
             file_handler = logging.handlers.RotatingFileHandler(
-                log_file, maxBytes=50 * 1024 * 1024, backupCount=10
+                log_file, maxBytes=50 * 1024 * 1024, backupCount=10, delay=True
             )
             file_handler.setFormatter(
                 logging.Formatter(
                     "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
                 )
             )
-            logging.getLogger().addHandler(file_handler)
+            root_logger.addHandler(file_handler)
 
     def start_session(self) -> str:
         """Start a new telemetry session."""
@@ -538,39 +1032,33 @@ class TelemetryManager:
                     session_id=self.current_session_id,
                 )
             )
+            self.events.flush()
             self.current_session_id = None
 
     def record_command_execution(
         self, command: str, success: bool, duration: float, **metadata
     ) -> None:
         """Record command execution telemetry."""
-        # Update metrics
-        self.metrics.increment_counter("commands_executed")
-        self.metrics.record_timer("command_duration", duration)
+        session_id = self.current_session_id
 
-        if success:
-            self.metrics.increment_counter("commands_successful")
-        else:
-            self.metrics.increment_counter("commands_failed")
+        # Update metrics
+        increment_counter = self._increment_counter
+        increment_counter("commands_executed")
+        self._record_timer("command_duration", duration)
+        increment_counter("commands_successful" if success else "commands_failed")
 
         # Log event
-        self.events.log_command_execution(
+        self._log_command(
             command=command,
             success=success,
             duration=duration,
-            session_id=self.current_session_id,
+            session_id=session_id,
             **metadata,
         )
 
         # Update session
-        if self.current_session_id:
-            self.sessions.update_session(
-                self.current_session_id,
-                commands_executed=self.sessions.get_session(
-                    self.current_session_id
-                ).commands_executed
-                + 1,
-            )
+        if session_id:
+            self._increment_session_counter(session_id, "commands_executed")
 
     def get_comprehensive_report(self) -> Dict[str, Any]:
         """Get comprehensive telemetry report."""
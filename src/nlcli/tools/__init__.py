@@ -1,3 +1,65 @@
 """
 Built-in tools for the Natural Language CLI.
+
+The git, network, package and process tools are declared as data in
+definitions.json, grouped by category.
 """
+
+import json
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict
+
+from nlcli.registry import Example, ToolArg, ToolCategory, ToolSchema
+
+DEFINITIONS_FILE = Path(__file__).parent / "definitions.json"
+
+
+def _build_schema(data: Dict[str, Any], category: ToolCategory) -> ToolSchema:
+    """Build a tool schema from its JSON declaration."""
+    args = {
+        name: ToolArg(
+            name,
+            spec["type"],
+            required=spec.get("required", False),
+            default=spec.get("default"),
+            description=spec.get("description", ""),
+        )
+        for name, spec in data.get("args", {}).items()
+    }
+    return ToolSchema(
+        name=data["name"],
+        summary=data["summary"],
+        args=args,
+        generator=data["generator"],
+        danger_level=data.get("danger_level", "read_only"),
+        examples=tuple(
+            Example(example["nl"], example.get("args", {}))
+            for example in data.get("examples", ())
+        ),
+        keywords=data.get("keywords"),
+        category=category,
+    )
+
+
+@lru_cache(maxsize=1)
+def _load_definitions() -> Dict[str, tuple[ToolSchema, ...]]:
+    """Read the tool declarations once and build schemas per category."""
+    data = json.loads(DEFINITIONS_FILE.read_text(encoding="utf-8"))
+    return {
+        category: tuple(
+            _build_schema(tool, ToolCategory[category.upper()]) for tool in tools
+        )
+        for category, tools in data.items()
+    }
+
+
+def load_tool_schemas(category: str) -> tuple[ToolSchema, ...]:
+    """Get the declared tool schemas for one category, e.g. ``"git"``."""
+    return _load_definitions()[category]
+
+
+def load_all() -> tuple[ToolSchema, ...]:
+    """Get the declared tool schemas for every category."""
+    return tuple(chain.from_iterable(_load_definitions().values()))
@@ -2,14 +2,20 @@
 File operation tools for the Natural Language CLI.
 """
 
-from typing import List
+from functools import lru_cache
 
-from nlcli.registry import ToolArg, ToolSchema
+from nlcli.registry import Example, ToolArg, ToolCategory, ToolSchema
 
 
-def get_file_tools() -> List[ToolSchema]:
-    """Get all file operation tool schemas."""
-    return [
+@lru_cache(maxsize=1)
+def get_file_tools() -> tuple[ToolSchema, ...]:
+    """
+    Get all file operation tool schemas.
+
+    The schemas are static, so they are built once and the same tuple is
+    returned on every call.
+    """
+    return (
         # Find files tool
         ToolSchema(
             name="find_files",
@@ -35,21 +41,22 @@ def get_file_tools() -> List[ToolSchema]:
                 "conversions": {"modified_within": "days"},
             },
             danger_level="read_only",
-            examples=[
-                {
-                    "nl": "files >1GB changed this week",
-                    "args": {"min_size": "1G", "modified_within": "7d"},
-                },
-                {
-                    "nl": "show large files in Downloads",
-                    "args": {"path": "~/Downloads", "min_size": "100M"},
-                },
-                {
-                    "nl": "find .py files modified today",
-                    "args": {"name": "*.py", "modified_within": "1d"},
-                },
-            ],
+            examples=(
+                Example(
+                    "files >1GB changed this week",
+                    {"min_size": "1G", "modified_within": "7d"},
+                ),
+                Example(
+                    "show large files in Downloads",
+                    {"path": "~/Downloads", "min_size": "100M"},
+                ),
+                Example(
+                    "find .py files modified today",
+                    {"name": "*.py", "modified_within": "1d"},
+                ),
+            ),
             keywords=["find", "files", "search", "large", "size", "modified", "recent"],
+            category=ToolCategory.FILE,
         ),
         # List directory contents
         ToolSchema(
@@ -63,16 +70,16 @@ def get_file_tools() -> List[ToolSchema]:
                 "sort": ToolArg("sort", "string"),
             },
             generator={
-                "cmd": "ls {long_flag}{human_flag}{all_flag} {sort_flag} {path}",
-                "clauses": {},
+                "cmd": "ls {long_flag}{human_flag}{all_flag} {sort_flag} {path}"
             },
             danger_level="read_only",
-            examples=[
-                {"nl": "list files in current directory", "args": {"path": "."}},
-                {"nl": "show all files including hidden", "args": {"all": True}},
-                {"nl": "list files sorted by size", "args": {"sort": "size"}},
-            ],
+            examples=(
+                Example("list files in current directory", {"path": "."}),
+                Example("show all files including hidden", {"all": True}),
+                Example("list files sorted by size", {"sort": "size"}),
+            ),
             keywords=["list", "ls", "show", "directory", "contents", "files"],
+            category=ToolCategory.FILE,
         ),
         # File content search
         ToolSchema(
@@ -102,20 +109,20 @@ def get_file_tools() -> List[ToolSchema]:
                 },
             },
             danger_level="read_only",
-            examples=[
-                {
-                    "nl": "search for TODO in all python files",
-                    "args": {"pattern": "TODO", "file_pattern": "*.py"},
-                },
-                {
-                    "nl": "find 'import pandas' in project files",
-                    "args": {"pattern": "import pandas", "path": "./src"},
-                },
-                {
-                    "nl": "grep for error messages ignoring case",
-                    "args": {"pattern": "error", "ignore_case": True},
-                },
-            ],
+            examples=(
+                Example(
+                    "search for TODO in all python files",
+                    {"pattern": "TODO", "file_pattern": "*.py"},
+                ),
+                Example(
+                    "find 'import pandas' in project files",
+                    {"pattern": "import pandas", "path": "./src"},
+                ),
+                Example(
+                    "grep for error messages ignoring case",
+                    {"pattern": "error", "ignore_case": True},
+                ),
+            ),
             keywords=[
                 "search",
                 "grep",
@@ -128,6 +135,7 @@ def get_file_tools() -> List[ToolSchema]:
                 "TODO",
                 "import",
             ],
+            category=ToolCategory.FILE,
         ),
         # Directory size analysis
         ToolSchema(
@@ -152,15 +160,13 @@ def get_file_tools() -> List[ToolSchema]:
                 },
             },
             danger_level="read_only",
-            examples=[
-                {"nl": "show directory sizes", "args": {"path": "."}},
-                {
-                    "nl": "disk usage for home directory",
-                    "args": {"path": "~", "depth": 2},
-                },
-                {"nl": "what's taking up space", "args": {"sort": True}},
-            ],
+            examples=(
+                Example("show directory sizes", {"path": "."}),
+                Example("disk usage for home directory", {"path": "~", "depth": 2}),
+                Example("what's taking up space", {"sort": True}),
+            ),
             keywords=["disk", "usage", "space", "size", "directory", "du", "storage"],
+            category=ToolCategory.FILE,
         ),
         # File information
         ToolSchema(
@@ -176,10 +182,11 @@ def get_file_tools() -> List[ToolSchema]:
                 "conversions": {"follow_links": lambda x: "-L" if x else ""},
             },
             danger_level="read_only",
-            examples=[
-                {"nl": "file info for README.md", "args": {"path": "README.md"}},
-                {"nl": "get details about that file", "args": {"path": "{context}"}},
-            ],
+            examples=(
+                Example("file info for README.md", {"path": "README.md"}),
+                Example("get details about that file", {"path": "{context}"}),
+            ),
             keywords=["info", "stat", "details", "metadata", "properties"],
+            category=ToolCategory.FILE,
         ),
-    ]
+    )
@@ -30,6 +30,13 @@ class TestContextEntity(unittest.TestCase):
         self.assertEqual(entity.confidence, 0.8)
         self.assertEqual(entity.reference_count, 0)
 
+    def test_entity_type_interned(self):
+        """Test that runtime-built entity types are interned and slotted."""
+        entity = ContextEntity(name="nginx", entity_type="".join(["pro", "cess"]))
+
+        self.assertIs(entity.entity_type, "process")
+        self.assertFalse(hasattr(entity, "__dict__"))
+
     def test_entity_reference_update(self):
         """Test updating entity reference."""
         entity = ContextEntity(name="test.txt", entity_type="file")
@@ -98,6 +105,20 @@ class TestEntityExtractor(unittest.TestCase):
         process_names = [e.name for e in process_entities]
         self.assertIn("nginx", process_names)
 
+    def test_repeated_extraction_returns_fresh_entities(self):
+        """Test that cached scans still hand out independent entities."""
+        first = self.extractor.extract_entities("kill nginx process")
+        first[0].update_reference()
+
+        second = self.extractor.extract_entities("Kill nginx process")
+
+        self.assertEqual(
+            [(e.name, e.entity_type) for e in first],
+            [(e.name, e.entity_type) for e in second],
+        )
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(second[0].reference_count, 0)
+
 
 class TestConversationMemory(unittest.TestCase):
     """Test conversation memory functionality."""
@@ -139,6 +160,24 @@ class TestConversationMemory(unittest.TestCase):
         self.memory.add_turn(turn)
         self.assertEqual(len(self.memory.turns), 1)
 
+    def test_add_turn_references_entities_at_turn_time(self):
+        """Test that mentioned entities take the turn's timestamp."""
+        self.memory.add_entity(ContextEntity(name="app.log", entity_type="file"))
+        turn = ConversationTurn(
+            user_input="tail app.log",
+            normalized_input="tail app.log",
+            intent_detected="file_view",
+            entities_mentioned=["app.log", "app.log"],
+            command_generated="tail app.log",
+            success=True,
+        )
+
+        self.memory.add_turn(turn)
+
+        entity = self.memory.entities["app.log"]
+        self.assertEqual(entity.reference_count, 2)
+        self.assertIs(entity.last_referenced, turn.timestamp)
+
     def test_get_recent_turns(self):
         """Test getting recent conversation turns."""
         # Add multiple turns
@@ -157,6 +196,28 @@ class TestConversationMemory(unittest.TestCase):
         self.assertEqual(len(recent), 3)
         self.assertEqual(recent[-1].user_input, "command 4")
 
+    def test_get_recent_turns_bounded(self):
+        """Test that recent turns respect the window and the requested count."""
+        for i in range(12):
+            self.memory.add_turn(
+                ConversationTurn(
+                    user_input=f"command {i}",
+                    normalized_input=f"command {i}",
+                    intent_detected="test",
+                    entities_mentioned=[],
+                    command_generated=f"echo {i}",
+                    success=i >= 2,
+                )
+            )
+
+        self.assertEqual(len(self.memory.turns), 10)
+        self.assertEqual(self.memory.successful_turns, 10)
+        self.assertEqual(
+            [turn.user_input for turn in self.memory.get_recent_turns(20)],
+            [f"command {i}" for i in range(2, 12)],
+        )
+        self.assertEqual(self.memory.get_recent_turns(0), [])
+
     def test_pronoun_resolution(self):
         """Test pronoun resolution."""
         # Add some entities
@@ -298,6 +359,29 @@ class TestAdvancedContextManager(unittest.TestCase):
         self.assertIn("success_rate", patterns["patterns"])
         self.assertIn("total_turns", patterns["patterns"])
 
+    def test_reset(self):
+        """Test that reset clears conversation state in place."""
+        self.manager.process_input("kill nginx process", {"cwd": "/tmp"})
+        self.manager.record_turn(
+            user_input="find test.txt",
+            enhanced_input="find test.txt",
+            intent="file_find",
+            command="find . -name test.txt",
+            success=True,
+            context={"relevant_entities": [{"name": "test.txt", "type": "file"}]},
+        )
+        self.manager.update_focus("file_operations")
+        self.manager.push_context({"operation": "find"})
+
+        self.assertTrue(self.manager.conversation_memory.entities)
+
+        self.manager.reset()
+
+        self.assertEqual(len(self.manager.conversation_memory.turns), 0)
+        self.assertEqual(self.manager.conversation_memory.entities, {})
+        self.assertIsNone(self.manager.current_focus)
+        self.assertIsNone(self.manager.pop_context())
+
     def test_global_manager_singleton(self):
         """Test global manager singleton."""
         manager1 = get_advanced_context_manager()
@@ -4,6 +4,8 @@ Tests for batch script parsing, execution, and management.
 """
 
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -20,6 +22,23 @@ from nlcli.context import ExecutionResult, Intent, SessionContext
 from nlcli.registry import ToolRegistry
 
 
+class MockCollaboratorsMixin:
+    """Provide spec'd session context, tool registry and LLM mocks."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # spec= introspects the whole class, so build the mocks once per class
+        cls.session_context = Mock(spec=SessionContext)
+        cls.tool_registry = Mock(spec=ToolRegistry)
+        cls.llm = Mock()
+
+    def setUp(self):
+        super().setUp()
+        for mock in (self.session_context, self.tool_registry, self.llm):
+            mock.reset_mock()
+
+
 class TestBatchCommand(unittest.TestCase):
     """Test batch command functionality."""
 
@@ -159,13 +178,11 @@ var: PATTERN=*.txt
             self.parser.parse_file(nonexistent_path)
 
 
-class TestBatchExecutor(unittest.TestCase):
+class TestBatchExecutor(MockCollaboratorsMixin, unittest.TestCase):
     """Test batch executor."""
 
     def setUp(self):
-        self.session_context = Mock(spec=SessionContext)
-        self.tool_registry = Mock(spec=ToolRegistry)
-        self.llm = Mock()
+        super().setUp()
         self.executor = BatchExecutor(
             self.session_context, self.tool_registry, self.llm
         )
@@ -262,6 +279,19 @@ class TestBatchExecutor(unittest.TestCase):
         expected = "find *.txt files in /tmp"
         self.assertEqual(processed.natural_language, expected)
 
+    def test_substitute_variables_single_pass(self):
+        """Test bare references, unknown names and values that look like refs."""
+        self.executor.variables = {"DIR": "$HOME", "HOME": "/root"}
+
+        command = BatchCommand(
+            natural_language="list $DIR and ${DIR_NAME} in $DIR_NAME",
+            variables={"DIR_NAME": "logs"},
+        )
+
+        processed = self.executor._substitute_variables(command)
+
+        self.assertEqual(processed.natural_language, "list $HOME and logs in logs")
+
     @patch("nlcli.engine.plan_and_generate")
     @patch("nlcli.executor.execute")
     def test_execute_command_success(self, mock_execute, mock_plan):
@@ -311,14 +341,122 @@ class TestBatchExecutor(unittest.TestCase):
         self.assertIn("[DRY RUN]", result.output)
         self.assertIn("ls -la", result.output)
 
+    @patch("nlcli.engine.plan_and_generate_batch")
+    def test_execute_script_parallel_groups(self, mock_plan_batch):
+        """Test that independent commands run concurrently and keep their order."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def run(command, dry_run, intent=None, variables=None):
+            if not command.depends_on:
+                # Blocks until all three independent commands are running
+                barrier.wait()
+            return BatchResult(command=command, success=True)
+
+        commands = [BatchCommand(f"command {i}", line_number=i) for i in range(1, 4)]
+        commands.append(BatchCommand("after", line_number=4, depends_on=[1, 2, 3]))
+        mock_plan_batch.return_value = [None, None, None]
+
+        with patch.object(self.executor, "_execute_command", side_effect=run):
+            results = self.executor.execute_script(
+                BatchScript(commands=commands), max_parallel=3
+            )
+
+        # The independent group is planned in a single call
+        mock_plan_batch.assert_called_once()
+
+        self.assertEqual(
+            [result.command.natural_language for result in results],
+            ["command 1", "command 2", "command 3", "after"],
+        )
+
+    @patch("nlcli.engine.plan_and_generate")
+    @patch("nlcli.engine.plan_and_generate_batch")
+    def test_parallel_workers_never_plan(self, mock_plan_batch, mock_plan):
+        """Test that commands the batch planner could not plan are not re-planned."""
+        mock_plan_batch.return_value = [None, None]
+        commands = [BatchCommand(f"command {i}", line_number=i) for i in (1, 2)]
+
+        results = self.executor.execute_script(
+            BatchScript(commands=commands),
+            dry_run=True,
+            stop_on_error=False,
+            max_parallel=2,
+        )
+
+        mock_plan.assert_not_called()
+        self.assertEqual(
+            [result.error for result in results],
+            ["Could not generate command from natural language"] * 2,
+        )
+
+    @patch("nlcli.engine.plan_and_generate")
+    @patch("nlcli.engine.plan_and_generate_batch", side_effect=RuntimeError)
+    def test_parallel_batch_planning_failure(self, mock_plan_batch, mock_plan):
+        """Test that a failed batch plan falls back to planning on this thread."""
+        planning_threads = []
+
+        def plan(*args):
+            planning_threads.append(threading.current_thread())
+
+        mock_plan.side_effect = plan
+        commands = [BatchCommand(f"command {i}", line_number=i) for i in (1, 2)]
+
+        results = self.executor.execute_script(
+            BatchScript(commands=commands),
+            dry_run=True,
+            stop_on_error=False,
+            max_parallel=2,
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(planning_threads, [threading.current_thread()] * 2)
+
+    @patch("nlcli.engine.plan_and_generate_batch")
+    @patch("nlcli.executor.execute")
+    def test_parallel_last_output_in_script_order(self, mock_execute, mock_plan_batch):
+        """Test that LAST_OUTPUT comes from the last command in the script."""
+        second_done = threading.Event()
+
+        def execute(command, context):
+            if command == "first":
+                # Finish after the second command
+                second_done.wait(timeout=5)
+                time.sleep(0.05)
+            else:
+                second_done.set()
+            return ExecutionResult(
+                success=True, output=f"{command} output", error="", exit_code=0
+            )
+
+        mock_execute.side_effect = execute
+        mock_plan_batch.return_value = [
+            Mock(spec=Intent, command="first"),
+            Mock(spec=Intent, command="second"),
+        ]
+        commands = [BatchCommand(f"command {i}", line_number=i) for i in (1, 2)]
+
+        self.executor.execute_script(BatchScript(commands=commands), max_parallel=2)
+
+        self.assertEqual(self.executor.variables["LAST_OUTPUT"], "second output")
+
+    @patch("nlcli.engine.plan_and_generate_batch")
+    def test_parallel_stop_on_error(self, mock_plan_batch):
+        """Test that a failure skips the rest of its group, as sequentially."""
+        mock_plan_batch.return_value = [None, Mock(spec=Intent, command="ls")]
+        commands = [BatchCommand(f"command {i}", line_number=i) for i in (1, 2)]
+
+        results = self.executor.execute_script(
+            BatchScript(commands=commands), dry_run=True, max_parallel=2
+        )
+
+        self.assertEqual([result.success for result in results], [False])
+
 
-class TestBatchModeManager(unittest.TestCase):
+class TestBatchModeManager(MockCollaboratorsMixin, unittest.TestCase):
     """Test batch mode manager."""
 
     def setUp(self):
-        self.session_context = Mock(spec=SessionContext)
-        self.tool_registry = Mock(spec=ToolRegistry)
-        self.llm = Mock()
+        super().setUp()
         self.manager = BatchModeManager(
             self.session_context, self.tool_registry, self.llm
         )
@@ -5,34 +5,148 @@ Tests the actual CLI interface with real commands in dry-run mode
 to ensure all the real-world scenarios work end-to-end.
 """
 
+import os
+import re
 import subprocess
+import sys
 import tempfile
+import threading
+import traceback
 import unittest
 from pathlib import Path
 
+import click
+from click.testing import CliRunner
+
+from nlcli import __version__
+from nlcli.main import main as nlcli_main
+
 # Base directory for tests (use Path to handle cross-platform paths)
-BASE_DIR = Path(__file__).parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Spawn the interpreter running the tests, which has already imported (and
+# byte-compiled) nlcli, rather than whatever "python" is first on PATH
+NLCLI = (sys.executable, "-m", "nlcli.main")
+
+# Environment for every CLI subprocess, built once. Unbuffered output means
+# whatever a child printed is already in the pipe if it is killed or times out.
+# (PYTHONDONTWRITEBYTECODE is left alone: any non-empty value disables .pyc
+# writes, even "0".)
+CHILD_ENV = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+# Upper bound for any single CLI subprocess, so a hang fails instead of stalling
+SUBPROCESS_TIMEOUT = 30
+
+BATCH_SCRIPT = b"""@name Test Script
+@description Test script for integration testing
+
+> list files in current directory
+> show system resource usage
+> ping localhost
+"""
+
+# Any of the ways the CLI reports that it refused to run a request
+BLOCKED_OUTPUT = re.compile(
+    r"couldn't understand|could not generate|blocked", re.IGNORECASE
+)
+
+# Set NLCLI_TEST_SUBPROCESS=1 to run every command in a fresh interpreter
+USE_SUBPROCESS = os.environ.get("NLCLI_TEST_SUBPROCESS") == "1"
+
+
+def run_and_scan(args):
+    """
+    Run the CLI in a subprocess, reading stderr as it is written.
+
+    Stops the process as soon as a traceback shows up instead of buffering all
+    of its output. Returns (returncode, whether a traceback was seen).
+    """
+    with subprocess.Popen(
+        [*NLCLI, *args],
+        cwd=BASE_DIR,
+        env=CHILD_ENV,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        # Iterating stderr blocks, so a hang is ended by killing the process
+        watchdog = threading.Timer(SUBPROCESS_TIMEOUT, proc.kill)
+        watchdog.start()
+        try:
+            for line in proc.stderr:
+                if b"Traceback" in line:
+                    proc.kill()
+                    return proc.wait(), True
+            return proc.wait(), False
+        finally:
+            watchdog.cancel()
+
+
+def invoke_nlcli(args):
+    """Run the CLI in this interpreter and return a CompletedProcess-like result."""
+    result = CliRunner().invoke(nlcli_main, args)
+
+    try:
+        stderr = result.stderr
+    except ValueError:  # Click < 8.2 mixes stderr into output
+        stderr = result.output
+
+    # An exception escaping main() would have been a traceback on stderr
+    if result.exception is not None and not isinstance(result.exception, SystemExit):
+        stderr += "".join(traceback.format_exception(*result.exc_info))
+
+    return subprocess.CompletedProcess(args, result.exit_code, result.output, stderr)
 
 
 class TestCLIIntegration(unittest.TestCase):
     """Integration tests for the CLI interface."""
 
-    def run_nlcli_command(self, command, extra_args=None):
+    def run_nlcli_command(self, command, extra_args=None, capture_stdout=False):
         """Run nlcli command and return result."""
-        args = ["python", "-m", "nlcli.main", "--dry-run"]
-        if extra_args:
-            args.extend(extra_args)
-        args.extend(["--batch-commands", command])
+        return self.run_nlcli_commands([command], extra_args, capture_stdout)
+
+    def run_nlcli_commands(self, commands, extra_args=None, capture_stdout=False):
+        """
+        Run several nlcli commands as one batch and return the result.
+
+        A subprocess only pipes stdout when capture_stdout is set; otherwise it
+        goes to /dev/null and result.stdout is None. In-process runs always
+        capture both streams.
+        """
+        args = ["--dry-run", *(extra_args or ())]
+        for command in commands:
+            args += ("--batch-commands", command)
+
+        if not USE_SUBPROCESS:
+            return invoke_nlcli(args)
 
         result = subprocess.run(
-            args,
+            [*NLCLI, *args],
             cwd=BASE_DIR,
-            capture_output=True,
+            env=CHILD_ENV,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=30,
+            timeout=SUBPROCESS_TIMEOUT,
         )
         return result
 
+    def assert_batch_ran(self, commands):
+        """Run commands in one batch and check each ran without a crash."""
+        result = self.run_nlcli_commands(
+            commands, ["--continue-on-error"], capture_stdout=True
+        )
+
+        # Should succeed or have reasonable error (1 if any command failed)
+        self.assertIn(result.returncode, [0, 1])
+        # Should not crash
+        self.assertNotIn("Traceback", result.stderr)
+
+        # Every command is reported, even after a failure
+        output = click.unstyle(result.stdout)
+        for number, cmd in enumerate(commands, 1):
+            with self.subTest(command=cmd):
+                self.assertIn(f"Command {number}: {cmd}", output)
+
     def test_file_operations_integration(self):
         """Test file operations through CLI interface."""
         commands = [
@@ -43,15 +157,7 @@ class TestCLIIntegration(unittest.TestCase):
             "list directories sorted by size",
         ]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed (exit code 0) or have reasonable error
-                self.assertIn(
-                    result.returncode, [0, 1]
-                )  # 1 is ok for some planning failures
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
     def test_process_management_integration(self):
         """Test process management through CLI interface."""
@@ -61,13 +167,7 @@ class TestCLIIntegration(unittest.TestCase):
             "display system resource usage",
         ]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed or have reasonable error
-                self.assertIn(result.returncode, [0, 1])
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
     def test_networking_integration(self):
         """Test networking through CLI interface."""
@@ -77,13 +177,7 @@ class TestCLIIntegration(unittest.TestCase):
             "resolve DNS for openai.com",
         ]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed or have reasonable error
-                self.assertIn(result.returncode, [0, 1])
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
     def test_git_and_package_integration(self):
         """Test git and package management through CLI interface."""
@@ -94,36 +188,19 @@ class TestCLIIntegration(unittest.TestCase):
             "show details of package curl",
         ]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed or have reasonable error
-                self.assertIn(result.returncode, [0, 1])
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
     def test_dangerous_commands_blocked(self):
         """Test that dangerous commands are properly blocked."""
-        dangerous_commands = [
-            "rm -rf /",
-            "chmod -R 777 *",
-            "dd if=/dev/zero of=/dev/sda",
-        ]
+        # The planner rejects each dangerous input (see test_nlcli.TestEngine);
+        # this only checks the CLI reports the rejection and exits non-zero
+        result = self.run_nlcli_command("rm -rf /", capture_stdout=True)
 
-        for cmd in dangerous_commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should fail - dangerous commands should be blocked at planning stage
-                self.assertEqual(result.returncode, 1)
-
-                # Should indicate command was not understood/blocked
-                output = result.stdout + result.stderr
-                self.assertTrue(
-                    "couldn't understand" in output.lower()
-                    or "could not generate" in output.lower()
-                    or "Command blocked" in output
-                    or "blocked" in output.lower()
-                )
+        # Should fail - dangerous commands should be blocked at planning stage
+        self.assertEqual(result.returncode, 1)
+
+        # Should indicate command was not understood/blocked
+        self.assertRegex(result.stdout + result.stderr, BLOCKED_OUTPUT)
 
     def test_multi_language_support(self):
         """Test multi-language input (if available)."""
@@ -144,58 +221,39 @@ class TestCLIIntegration(unittest.TestCase):
 
     def test_batch_script_execution(self):
         """Test batch script execution."""
-        script_content = """@name Test Script
-@description Test script for integration testing
+        # A temporary directory cleans itself up and, unlike an open
+        # NamedTemporaryFile, can be read by the child on every platform
+        with tempfile.TemporaryDirectory() as temp_dir:
+            script_path = Path(temp_dir) / "test.nlcli"
+            script_path.write_bytes(BATCH_SCRIPT)
 
-> list files in current directory
-> show system resource usage
-> ping localhost
-"""
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".nlcli", delete=False) as f:
-            f.write(script_content)
-            script_path = f.name
-
-        try:
             # Test batch script execution
             result = subprocess.run(
-                ["python", "-m", "nlcli.main", "--dry-run", "--batch", script_path],
+                [*NLCLI, "--dry-run", "--batch", str(script_path)],
                 cwd=BASE_DIR,
+                env=CHILD_ENV,
                 capture_output=True,
-                text=True,
-                timeout=30,
+                timeout=SUBPROCESS_TIMEOUT,
             )
 
-            # Should succeed
-            self.assertIn(result.returncode, [0, 1])
-            # Should not crash
-            self.assertNotIn("Traceback", result.stderr)
-            # Should execute multiple commands
-            self.assertIn("batch", result.stdout.lower())
-
-        finally:
-            Path(script_path).unlink()
+        # Should succeed
+        self.assertIn(result.returncode, [0, 1])
+        # Should not crash
+        self.assertNotIn(b"Traceback", result.stderr)
+        # Should execute multiple commands
+        self.assertIn(b"batch", result.stdout.lower())
 
     def test_help_and_version_commands(self):
         """Test basic CLI functionality."""
         # Test help
-        result = subprocess.run(
-            ["python", "-m", "nlcli.main", "--help"],
-            cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
-        )
+        result = invoke_nlcli(["--help"])
         self.assertEqual(result.returncode, 0)
         self.assertIn("Natural Language Driven CLI", result.stdout)
 
         # Test version
-        result = subprocess.run(
-            ["python", "-m", "nlcli.main", "--version"],
-            cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
-        )
+        result = invoke_nlcli(["--version"])
         self.assertEqual(result.returncode, 0)
+        self.assertIn(__version__, result.stdout)
 
     def test_docker_plugin_integration(self):
         """Test Docker plugin functionality (if available)."""
@@ -204,13 +262,7 @@ class TestCLIIntegration(unittest.TestCase):
             "list all docker containers including stopped",
         ]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed or have reasonable error
-                self.assertIn(result.returncode, [0, 1])
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
     def test_context_awareness_simulation(self):
         """Test context awareness through batch commands."""
@@ -221,19 +273,10 @@ class TestCLIIntegration(unittest.TestCase):
         ]
 
         # Test as batch commands to simulate context
-        result = subprocess.run(
-            ["python", "-m", "nlcli.main", "--dry-run"]
-            + ["--batch-commands"]
-            + commands,
-            cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = self.run_nlcli_commands(commands)
 
-        # Should succeed or have reasonable error (including exit code 2 for some
-        # errors)
-        self.assertIn(result.returncode, [0, 1, 2])
+        # Should succeed or have reasonable error
+        self.assertIn(result.returncode, [0, 1])
         # Should not crash
         self.assertNotIn("Traceback", result.stderr)
 
@@ -243,71 +286,48 @@ class TestCLIIntegration(unittest.TestCase):
         # or as regular tools, depending on implementation
         commands = ["performance", "show system information", "list available tools"]
 
-        for cmd in commands:
-            with self.subTest(command=cmd):
-                result = self.run_nlcli_command(cmd)
-                # Should succeed or have reasonable error
-                self.assertIn(result.returncode, [0, 1])
-                # Should not crash
-                self.assertNotIn("Traceback", result.stderr)
+        self.assert_batch_ran(commands)
 
 
 class TestCLIErrorHandling(unittest.TestCase):
     """Test CLI error handling and edge cases."""
 
+    LONG_INPUT = "a" * 1000
+
     def test_invalid_batch_file(self):
         """Test handling of invalid batch file."""
         result = subprocess.run(
-            ["python", "-m", "nlcli.main", "--batch", "/nonexistent/file.nlcli"],
+            [*NLCLI, "--batch", "/nonexistent/file.nlcli"],
             cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
+            env=CHILD_ENV,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=SUBPROCESS_TIMEOUT,
         )
         # Should fail gracefully (exit code 1 or 2 are both acceptable for errors)
         self.assertIn(result.returncode, [1, 2])
-        # Should contain error message
+        # Should contain error message (bytes: only ASCII words are searched)
         stderr_lower = result.stderr.lower()
-        self.assertTrue("error" in stderr_lower or "failed" in stderr_lower)
+        self.assertTrue(b"error" in stderr_lower or b"failed" in stderr_lower)
 
     def test_empty_command(self):
         """Test handling of empty commands."""
-        result = subprocess.run(
-            ["python", "-m", "nlcli.main", "--dry-run", "--batch-commands", ""],
-            cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
-        )
+        returncode, traceback_seen = run_and_scan(["--dry-run", "--batch-commands", ""])
         # Should handle gracefully
-        self.assertIn(result.returncode, [0, 1])
+        self.assertIn(returncode, [0, 1])
+        self.assertFalse(traceback_seen)
 
     def test_malformed_natural_language(self):
         """Test handling of malformed natural language input."""
-        weird_commands = [
-            "asdfasdf random nonsense",
-            "123456789",
-            "!@#$%^&*()",
-            "a" * 1000,  # Very long input
-        ]
+        # Nonsense input is covered against the planner in test_nlcli; the CLI
+        # run only needs the worst case: a very long input
+        returncode, traceback_seen = run_and_scan(
+            ["--dry-run", "--batch-commands", self.LONG_INPUT]
+        )
 
-        for cmd in weird_commands:
-            with self.subTest(command=cmd):
-                result = subprocess.run(
-                    [
-                        "python",
-                        "-m",
-                        "nlcli.main",
-                        "--dry-run",
-                        "--batch-commands",
-                        cmd,
-                    ],
-                    cwd=BASE_DIR,
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                # Should handle gracefully without crashing
-                self.assertIn(result.returncode, [0, 1])
-                self.assertNotIn("Traceback", result.stderr)
+        # Should handle gracefully without crashing
+        self.assertIn(returncode, [0, 1])
+        self.assertFalse(traceback_seen)
 
 
 if __name__ == "__main__":
@@ -5,10 +5,12 @@ Tests for cloud LLM providers and fallback functionality.
 
 import json
 import unittest
+from dataclasses import replace
 from unittest.mock import MagicMock, Mock, patch  # noqa: F401
 from urllib.error import HTTPError, URLError
 from urllib.request import Request  # noqa: F401
 
+from nlcli import cloud_llm
 from nlcli.cloud_llm import (
     CloudLLMConfig,
     CloudLLMProvider,
@@ -18,6 +20,35 @@ from nlcli.cloud_llm import (
     get_cloud_llm_service,
 )
 
+# Encoded provider payloads, built once at import
+OPENAI_OK = json.dumps(
+    {
+        "choices": [{"message": {"content": "Test response"}}],
+        "usage": {"total_tokens": 10},
+    }
+).encode("utf-8")
+ANTHROPIC_OK = json.dumps(
+    {
+        "content": [{"text": "Anthropic response"}],
+        "usage": {"input_tokens": 5, "output_tokens": 8},
+    }
+).encode("utf-8")
+GOOGLE_OK = json.dumps(
+    {"candidates": [{"content": {"parts": [{"text": "Google response"}]}}]}
+).encode("utf-8")
+OPENAI_ERROR = json.dumps({"error": {"message": "Invalid API key"}}).encode("utf-8")
+
+# Parsed OpenAI response; tests derive their variants with dataclasses.replace
+OPENAI_RESPONSE = CloudLLMResponse(text="", provider="openai", model="gpt-3.5-turbo")
+
+
+def mock_http_response(payload):
+    """Build a urlopen() context manager whose response reads payload."""
+    response = MagicMock()
+    response.__enter__.return_value.read.return_value = payload
+    response.__exit__.return_value = False
+    return response
+
 
 class TestCloudLLMConfig(unittest.TestCase):
     """Test cloud LLM configuration."""
@@ -55,15 +86,25 @@ class TestCloudLLMConfig(unittest.TestCase):
 class TestCloudLLMProvider(unittest.TestCase):
     """Test cloud LLM provider."""
 
-    def setUp(self):
-        self.config = CloudLLMConfig(
+    @classmethod
+    def setUpClass(cls):
+        # Requests never mutate the provider, so the fixtures are shared
+        cls.config = CloudLLMConfig(
             enabled=True,
             openai_api_key="test-openai-key",
             anthropic_api_key="test-anthropic-key",
             google_api_key="test-google-key",
         )
-        self.provider = CloudLLMProvider(self.config)
-        self.messages = [{"role": "user", "content": "test message"}]
+        cls.provider = CloudLLMProvider(cls.config)
+        cls.messages = [{"role": "user", "content": "test message"}]
+
+        # Patch urlopen once for the class; each test configures the mock
+        urlopen_patcher = patch.object(cloud_llm, "urlopen")
+        cls.mock_urlopen = urlopen_patcher.start()
+        cls.addClassCleanup(urlopen_patcher.stop)
+
+    def setUp(self):
+        self.mock_urlopen.reset_mock(return_value=True, side_effect=True)
 
     def test_unsupported_provider(self):
         """Test request to unsupported provider."""
@@ -73,18 +114,9 @@ class TestCloudLLMProvider(unittest.TestCase):
         self.assertIn("Unsupported provider", response.error)
         self.assertEqual(response.provider, "unsupported")
 
-    @patch("nlcli.cloud_llm.urlopen")
-    def test_openai_request_success(self, mock_urlopen):
+    def test_openai_request_success(self):
         """Test successful OpenAI API request."""
-        # Mock response
-        mock_response = Mock()
-        mock_response.read.return_value = json.dumps(
-            {
-                "choices": [{"message": {"content": "Test response"}}],
-                "usage": {"total_tokens": 10},
-            }
-        ).encode("utf-8")
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        self.mock_urlopen.return_value = mock_http_response(OPENAI_OK)
 
         response = self.provider.make_request(self.messages, "openai")
 
@@ -93,17 +125,9 @@ class TestCloudLLMProvider(unittest.TestCase):
         self.assertEqual(response.provider, "openai")
         self.assertEqual(response.tokens_used, 10)
 
-    @patch("nlcli.cloud_llm.urlopen")
-    def test_anthropic_request_success(self, mock_urlopen):
+    def test_anthropic_request_success(self):
         """Test successful Anthropic API request."""
-        mock_response = Mock()
-        mock_response.read.return_value = json.dumps(
-            {
-                "content": [{"text": "Anthropic response"}],
-                "usage": {"input_tokens": 5, "output_tokens": 8},
-            }
-        ).encode("utf-8")
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        self.mock_urlopen.return_value = mock_http_response(ANTHROPIC_OK)
 
         response = self.provider.make_request(self.messages, "anthropic")
 
@@ -112,14 +136,9 @@ class TestCloudLLMProvider(unittest.TestCase):
         self.assertEqual(response.provider, "anthropic")
         self.assertEqual(response.tokens_used, 13)  # input + output tokens
 
-    @patch("nlcli.cloud_llm.urlopen")
-    def test_google_request_success(self, mock_urlopen):
+    def test_google_request_success(self):
         """Test successful Google API request."""
-        mock_response = Mock()
-        mock_response.read.return_value = json.dumps(
-            {"candidates": [{"content": {"parts": [{"text": "Google response"}]}}]}
-        ).encode("utf-8")
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        self.mock_urlopen.return_value = mock_http_response(GOOGLE_OK)
 
         response = self.provider.make_request(self.messages, "google")
 
@@ -127,28 +146,22 @@ class TestCloudLLMProvider(unittest.TestCase):
         self.assertEqual(response.text, "Google response")
         self.assertEqual(response.provider, "google")
 
-    @patch("nlcli.cloud_llm.urlopen")
-    def test_http_error(self, mock_urlopen):
+    def test_http_error(self):
         """Test HTTP error handling."""
         mock_error = HTTPError(
             url="http://test.com", code=401, msg="Unauthorized", hdrs={}, fp=None
         )
-        mock_error.read = Mock(
-            return_value=json.dumps({"error": {"message": "Invalid API key"}}).encode(
-                "utf-8"
-            )
-        )
-        mock_urlopen.side_effect = mock_error
+        mock_error.read = Mock(return_value=OPENAI_ERROR)
+        self.mock_urlopen.side_effect = mock_error
 
         response = self.provider.make_request(self.messages, "openai")
 
         self.assertFalse(response.success)
         self.assertIn("Invalid API key", response.error)
 
-    @patch("nlcli.cloud_llm.urlopen")
-    def test_network_error(self, mock_urlopen):
+    def test_network_error(self):
         """Test network error handling."""
-        mock_urlopen.side_effect = URLError("Network error")
+        self.mock_urlopen.side_effect = URLError("Network error")
 
         response = self.provider.make_request(self.messages, "openai")
 
@@ -169,14 +182,17 @@ class TestCloudLLMProvider(unittest.TestCase):
 class TestCloudLLMService(unittest.TestCase):
     """Test cloud LLM service."""
 
-    def setUp(self):
-        self.config = CloudLLMConfig(
+    @classmethod
+    def setUpClass(cls):
+        # Tests that change the configuration build their own service
+        cls.config = CloudLLMConfig(
             enabled=True,
             openai_api_key="test-key",
             primary_provider="openai",
             fallback_providers=["anthropic"],
+            retry_delay=0,  # Retries are mocked, so don't sleep between them
         )
-        self.service = CloudLLMService(self.config)
+        cls.service = CloudLLMService(cls.config)
 
     def test_service_availability(self):
         """Test service availability check."""
@@ -190,12 +206,8 @@ class TestCloudLLMService(unittest.TestCase):
     @patch.object(CloudLLMProvider, "make_request")
     def test_successful_generation(self, mock_make_request):
         """Test successful response generation."""
-        mock_make_request.return_value = CloudLLMResponse(
-            text="Generated response",
-            provider="openai",
-            model="gpt-3.5-turbo",
-            success=True,
-            confidence=0.8,
+        mock_make_request.return_value = replace(
+            OPENAI_RESPONSE, text="Generated response", confidence=0.8
         )
 
         response = self.service.generate_response("test prompt")
@@ -209,13 +221,7 @@ class TestCloudLLMService(unittest.TestCase):
         """Test fallback to secondary provider on failure."""
         # First call fails, second succeeds
         mock_make_request.side_effect = [
-            CloudLLMResponse(
-                text="",
-                provider="openai",
-                model="gpt-3.5-turbo",
-                success=False,
-                error="API error",
-            ),
+            replace(OPENAI_RESPONSE, success=False, error="API error"),
             CloudLLMResponse(
                 text="Fallback response",
                 provider="anthropic",
@@ -225,9 +231,11 @@ class TestCloudLLMService(unittest.TestCase):
         ]
 
         # Configure with Anthropic key for fallback
-        self.config.anthropic_api_key = "anthropic-key"
+        service = CloudLLMService(
+            replace(self.config, anthropic_api_key="anthropic-key")
+        )
 
-        response = self.service.generate_response("test prompt")
+        response = service.generate_response("test prompt")
 
         self.assertTrue(response.success)
         self.assertEqual(response.text, "Fallback response")
@@ -236,12 +244,8 @@ class TestCloudLLMService(unittest.TestCase):
     @patch.object(CloudLLMProvider, "make_request")
     def test_all_providers_fail(self, mock_make_request):
         """Test when all providers fail."""
-        mock_make_request.return_value = CloudLLMResponse(
-            text="",
-            provider="openai",
-            model="gpt-3.5-turbo",
-            success=False,
-            error="All failed",
+        mock_make_request.return_value = replace(
+            OPENAI_RESPONSE, success=False, error="All failed"
         )
 
         response = self.service.generate_response("test prompt")
@@ -274,11 +278,8 @@ class TestCloudLLMService(unittest.TestCase):
     def test_generate_with_system_prompt(self):
         """Test generation with system prompt."""
         with patch.object(self.service.provider, "make_request") as mock_request:
-            mock_request.return_value = CloudLLMResponse(
-                text="Response with system",
-                provider="openai",
-                model="gpt-3.5-turbo",
-                success=True,
+            mock_request.return_value = replace(
+                OPENAI_RESPONSE, text="Response with system"
             )
 
             response = self.service.generate_response("user prompt", "system prompt")
@@ -310,12 +311,17 @@ class TestGlobalFunctions(unittest.TestCase):
         self.assertTrue(service.config.enabled)
         self.assertEqual(service.config.primary_provider, "anthropic")
 
-    def test_global_service_singleton(self):
+    @patch.object(cloud_llm, "_cloud_llm_service", None)
+    @patch.object(cloud_llm, "create_cloud_llm_service")
+    def test_global_service_singleton(self, mock_create):
         """Test global service singleton."""
         service1 = get_cloud_llm_service()
         service2 = get_cloud_llm_service()
 
         self.assertIs(service1, service2)
+        # Built once from an empty slot, whatever ran before this test
+        self.assertIs(service1, mock_create.return_value)
+        mock_create.assert_called_once_with()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ Tests for language detection, translation, and processing.
 
 import os
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from nlcli.language import (
     LanguageConfig,
@@ -58,6 +58,55 @@ class TestLanguageSupport(unittest.TestCase):
         self.assertEqual(lang, "en")
         self.assertLessEqual(confidence, 0.5)
 
+    def test_detectors_share_compiled_patterns(self):
+        """Test that patterns are compiled once, not per detector."""
+        other = LanguageDetector()
+
+        self.assertIs(other._compiled_patterns, self.detector._compiled_patterns)
+        self.assertEqual(
+            set(self.detector._compiled_patterns), set(self.detector.language_patterns)
+        )
+
+    def test_language_detection_with_model(self):
+        """Test that a confident fastText prediction is used directly."""
+        self.detector.model = Mock()
+        self.detector.model.predict.return_value = (("__label__fr",), [0.93])
+
+        lang, confidence = self.detector.detect_language("lister\ntous les fichiers")
+
+        self.assertEqual(lang, "fr")
+        self.assertAlmostEqual(confidence, 0.93)
+        self.detector.model.predict.assert_called_once_with(
+            "lister tous les fichiers", k=1
+        )
+
+    def test_language_detection_model_low_confidence(self):
+        """Test that an unsure fastText prediction falls back to patterns."""
+        self.detector.model = Mock()
+        self.detector.model.predict.return_value = (("__label__fr",), [0.2])
+
+        lang, confidence = self.detector.detect_language("show all files")
+
+        self.assertEqual(lang, "en")
+
+    def test_language_detection_model_unsupported_label(self):
+        """Test that a language without patterns falls back to patterns."""
+        self.detector.model = Mock()
+        self.detector.model.predict.return_value = (("__label__ja",), [0.99])
+
+        lang, confidence = self.detector.detect_language("mostrar todos los archivos")
+
+        self.assertEqual(lang, "es")
+
+    def test_language_detection_model_failure(self):
+        """Test that a failing fastText model falls back to patterns."""
+        self.detector.model = Mock()
+        self.detector.model.predict.side_effect = ValueError("copy=False")
+
+        lang, confidence = self.detector.detect_language("show all files")
+
+        self.assertEqual(lang, "en")
+
     def test_spanish_translation(self):
         """Test Spanish to English translation."""
         text = "mostrar todos los archivos"
@@ -88,6 +137,24 @@ class TestLanguageSupport(unittest.TestCase):
         self.assertIn("files", translated.lower())
         self.assertIn("show", translated.lower())
 
+    def test_translation_ignores_punctuation(self):
+        """Test that punctuation does not stop a word from being translated."""
+        translated = self.translator.translate_to_english(
+            "¿mostrar archivos, directorios?", "es"
+        )
+
+        self.assertEqual(translated, "show files directories")
+
+    def test_translation_cached(self):
+        """Test that repeated translations are served from the cache."""
+        first = self.translator.translate_to_english("Mostrar archivos", "es")
+        second = self.translator.translate_to_english("mostrar ARCHIVOS", "es")
+
+        self.assertEqual(first, "show files")
+        self.assertEqual(second, first)
+        info = self.translator._translate.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
     def test_no_translation_for_english(self):
         """Test that English text is not translated."""
         text = "show all files"
@@ -138,6 +205,14 @@ class TestLanguageSupport(unittest.TestCase):
         self.assertTrue(result["needs_translation"])
         self.assertIn("show", result["translated_text"].lower())
 
+    def test_process_batch_keeps_order(self):
+        """Test batch processing, serial and in worker processes."""
+        texts = ["list all processes", "mostrar archivos grandes"] * 20
+        expected = [self.processor.process_input(text) for text in texts]
+
+        self.assertEqual(self.processor.process_batch(texts[:4]), expected[:4])
+        self.assertEqual(self.processor.process_batch(texts, workers=2), expected)
+
     def test_get_response_language(self):
         """Test getting appropriate response language."""
         # Supported language
@@ -183,6 +258,18 @@ class TestLanguageSupport(unittest.TestCase):
 
         self.assertIs(processor1, processor2)
 
+    def test_global_processor_cache_clear(self):
+        """Test that clearing the singleton rebuilds it from the environment."""
+        get_language_processor()
+        self.addCleanup(get_language_processor.cache_clear)
+
+        get_language_processor.cache_clear()
+        with patch.dict(os.environ, {"NLCLI_DEFAULT_LANG": "fr"}):
+            processor = get_language_processor()
+
+        self.assertEqual(processor.config.default_language, "fr")
+        self.assertIs(get_language_processor(), processor)
+
     def test_partial_translation(self):
         """Test partial translation of mixed content."""
         text = "mostrar files and directories"  # Mixed Spanish/English
@@ -2,14 +2,21 @@
 Test the core Natural Language CLI functionality.
 """
 
+import os
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 from nlcli.context import Intent, SessionContext
-from nlcli.engine import explain, plan_and_generate
+from nlcli.engine import explain, plan_and_generate, plan_and_generate_batch
 from nlcli.executor import execute
-from nlcli.registry import ToolArg, ToolRegistry, ToolSchema  # noqa: F401
+from nlcli.registry import (  # noqa: F401
+    CommandTemplate,
+    Example,
+    ToolArg,
+    ToolRegistry,
+    ToolSchema,
+)
 from nlcli.safety import guard
 
 
@@ -36,6 +43,14 @@ class TestSessionContext(unittest.TestCase):
         resolved = self.context.resolve_pronouns("delete those files")
         self.assertIn("file1.txt", resolved)
 
+    def test_pronoun_resolution_whole_words(self):
+        """Test that only whole pronouns are replaced, in a single pass."""
+        self.context.recent_files = ["/tmp/them.txt"]
+        self.context.filters["active_path"] = "/srv"
+
+        resolved = self.context.resolve_pronouns("copy them with same theme")
+        self.assertEqual(resolved, "copy /tmp/them.txt with in /srv theme")
+
 
 class TestToolRegistry(unittest.TestCase):
     """Test tool registry functionality."""
@@ -52,6 +67,115 @@ class TestToolRegistry(unittest.TestCase):
         tool_names = [tool.name for tool, _ in matches]
         self.assertIn("find_files", tool_names)
 
+    def test_keyword_index_tracks_registration(self):
+        """Test that newly registered tools are matched by keyword."""
+        self.assertEqual(self.registry.find_matching_tools("frobnicate now"), [])
+
+        self.registry.register_tool(
+            ToolSchema(
+                name="frobnicate",
+                summary="Frobnicate things",
+                args={},
+                generator={"cmd": "frob"},
+                keywords=["frobnicate"],
+            )
+        )
+
+        matches = self.registry.find_matching_tools("frobnicate now")
+        self.assertEqual(matches[0][0].name, "frobnicate")
+
+    def test_unrelated_tools_not_scored(self):
+        """Test that only tools sharing words with the input are scored."""
+        self.registry.register_tool(
+            ToolSchema(
+                name="widget_sync",
+                summary="Synchronize widgets",
+                args={},
+                generator={"cmd": "wsync"},
+            )
+        )
+
+        with patch.object(
+            self.registry,
+            "_calculate_match_score",
+            wraps=self.registry._calculate_match_score,
+        ) as score:
+            self.registry.find_matching_tools("show disk usage")
+            scored = {call.args[0].name for call in score.call_args_list}
+            self.assertNotIn("widget_sync", scored)
+
+            matches = self.registry.find_matching_tools("synchronize widgets")
+            self.assertEqual(matches[0][0].name, "widget_sync")
+
+    def test_schema_strings_interned(self):
+        """Test that runtime-built schema strings are interned."""
+        arg_type = "".join(["str", "ing"])
+        danger_level = "".join(["read", "_only"])
+        tool = ToolSchema(
+            name="interned",
+            summary="Interned strings",
+            args={"path": ToolArg("path", arg_type)},
+            generator={"cmd": "true"},
+            danger_level=danger_level,
+            keywords=["".join(["fi", "les"])],
+        )
+
+        self.assertIs(tool.args["path"].type, "string")
+        self.assertIs(tool.danger_level, "read_only")
+        self.assertIs(tool.keywords[0], "files")
+
+    def test_schema_word_sets(self):
+        """Test that summary and example words are split once and interned."""
+        tool = ToolSchema(
+            name="word_sets",
+            summary="Show Large FILES",
+            args={},
+            generator={"cmd": "true"},
+            examples=[Example("".join(["show ", "files"]))],
+        )
+
+        self.assertEqual(tool.summary_words, {"show", "large", "files"})
+        self.assertEqual(tool.example_words, (frozenset({"show", "files"}),))
+        word = next(word for word in tool.example_words[0] if word == "files")
+        self.assertIs(word, "files")
+
+    def test_keywords_lowercased(self):
+        """Test that keywords match the lowercased input regardless of case."""
+        tool = self.registry.get_tool("search_content")
+        self.assertIn("todo", tool.keywords)
+        self.assertNotIn("TODO", tool.keywords)
+
+    def test_keyword_tuples_shared(self):
+        """Test that schemas with the same keyword set share one tuple."""
+        first = ToolSchema(
+            name="first",
+            summary="First",
+            args={},
+            generator={"cmd": "true"},
+            keywords=["alpha", "beta"],
+        )
+        second = ToolSchema(
+            name="second",
+            summary="Second",
+            args={},
+            generator={"cmd": "true"},
+            keywords=["beta", "Alpha"],
+        )
+
+        self.assertIs(first.keywords, second.keywords)
+
+    def test_dict_examples_converted(self):
+        """Test that plugin-style dict examples become Example records."""
+        tool = ToolSchema(
+            name="greet",
+            summary="Greet someone",
+            args={},
+            generator={"cmd": "echo hi"},
+            examples=[{"nl": "say hello", "args": {"name": "World"}}],
+        )
+
+        self.assertEqual(tool.examples, (Example("say hello", {"name": "World"}),))
+
     def test_extract_size_args(self):
         """Test size argument extraction."""
         tool = self.registry.get_tool("find_files")
@@ -70,6 +194,79 @@ class TestToolRegistry(unittest.TestCase):
         self.assertIn("-size +1G", command)
         self.assertIn("-mtime -7", command)
 
+        # Clause templates are compiled and shared like command templates
+        clauses = tool.generator["clauses"]
+        self.assertIn(clauses["size_clause"], CommandTemplate._pool)
+        self.assertIn(clauses["time_clause"], CommandTemplate._pool)
+
+    def test_generate_command_cached(self):
+        """Test that registered tools reuse commands for repeated arguments."""
+        tool = self.registry.get_tool("ping_host")
+
+        with patch.object(
+            self.registry, "_generate_ping_command", return_value="ping -c 4 host"
+        ) as generate:
+            first = self.registry.generate_command(tool, {"host": "host"})
+            second = self.registry.generate_command(tool, {"host": "host"})
+            self.registry.generate_command(tool, {"host": "other"})
+
+        self.assertIs(first, second)
+        self.assertEqual(generate.call_count, 2)
+
+        # Re-registering a tool drops what was generated for the old schema
+        self.registry.register_tool(tool)
+        self.assertEqual(self.registry._command_cache, {})
+
+    def test_generate_command_from_template(self):
+        """Test generic template rendering for custom tools."""
+        tool = ToolSchema(
+            name="greet",
+            summary="Greet someone",
+            args={
+                "name": ToolArg("name", "string", default="World"),
+                "target": ToolArg("target", "string", required=True),
+            },
+            generator={"cmd": "echo 'Hello, {name}!' > {target}"},
+        )
+
+        self.assertIsNone(tool._template)
+
+        command = self.registry.generate_command(tool, {"target": "out.txt"})
+        self.assertEqual(command, "echo 'Hello, World!' > out.txt")
+        self.assertIs(tool._template, CommandTemplate.of(tool.generator["cmd"]))
+
+        with self.assertRaises(ValueError):
+            self.registry.generate_command(tool, {})
+
+    def test_command_template_shared(self):
+        """Test that equal templates compile once and can be passed directly."""
+        template = CommandTemplate.of("git log {flags} -{limit}")
+        self.assertIs(template, CommandTemplate.of("git log {flags} -{limit}"))
+        self.assertEqual(template.fields, ("flags", "limit"))
+
+        tool = ToolSchema(
+            name="recent_commits",
+            summary="Show recent commits",
+            args={
+                "flags": ToolArg("flags", "string", default="--oneline"),
+                "limit": ToolArg("limit", "integer", default=5),
+            },
+            generator={"cmd": template},
+        )
+        command = self.registry.generate_command(tool, {})
+        self.assertEqual(command, "git log --oneline -5")
+
+    def test_command_template_format_fields(self):
+        """Test that format specs, conversions and lookups render like format."""
+        values = {"n": 7, "x": "a b", "a": Mock(b="attr"), "items": ["first"]}
+        for template in ("head -n {n:03d}", "echo {x!r}", "echo {a.b} {items[0]}"):
+            compiled = CommandTemplate(template)
+            self.assertEqual(compiled.render(values), template.format(**values))
+
+        self.assertEqual(CommandTemplate("{a.b} {items[0]}").fields, ("a", "items"))
+        with self.assertRaises(KeyError):
+            CommandTemplate("head -n {n:03d}").render({})
+
 
 class TestEngine(unittest.TestCase):
     """Test the planning and generation engine."""
@@ -86,6 +283,36 @@ class TestEngine(unittest.TestCase):
         self.assertEqual(intent.tool_name, "find_files")
         self.assertIn("find", intent.command)
 
+    def test_plan_and_generate_batch(self):
+        """Test that batch planning keeps order and plans repeats once."""
+        intents = plan_and_generate_batch(
+            ["find files >1GB", "git status", "find files >1GB"],
+            self.context,
+            self.tools,
+        )
+
+        self.assertEqual(
+            [intent.tool_name for intent in intents],
+            ["find_files", "git_status", "find_files"],
+        )
+        self.assertIs(intents[0], intents[2])
+
+    def test_dangerous_input_not_planned(self):
+        """Test that raw dangerous commands never become a runnable intent."""
+        for nl_input in ["rm -rf /", "chmod -R 777 *", "dd if=/dev/zero of=/dev/sda"]:
+            with self.subTest(nl_input=nl_input):
+                intent = plan_and_generate(nl_input, self.context, self.tools)
+                with patch("builtins.print"):
+                    # Either nothing is planned or the safety guard refuses it
+                    blocked = intent is None or not guard(intent, self.context)
+                self.assertTrue(blocked)
+
+    def test_malformed_input_handled(self):
+        """Test that empty or nonsense input is rejected without raising."""
+        for nl_input in ["", "asdfasdf random nonsense", "123456789", "!@#$%^&*()"]:
+            with self.subTest(nl_input=nl_input):
+                self.assertIsNone(plan_and_generate(nl_input, self.context, self.tools))
+
     def test_explain_intent(self):
         """Test explanation generation."""
         intent = Intent(
@@ -171,6 +398,45 @@ class TestExecutor(unittest.TestCase):
         self.assertEqual(result.error, "error message")
         self.assertEqual(result.exit_code, 1)
 
+    @patch("subprocess.Popen")
+    def test_execute_starts_new_session(self, mock_popen):
+        """Test that commands get their own session without a preexec_fn."""
+        mock_process = Mock()
+        mock_process.communicate.return_value = ("", "")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        execute("ls", self.context)
+
+        kwargs = mock_popen.call_args.kwargs
+        self.assertNotIn("preexec_fn", kwargs)
+        self.assertEqual(kwargs["start_new_session"], os.name != "nt")
+
+    @patch("nlcli.executor.shutil.which", return_value="/usr/bin/git")
+    @patch("subprocess.Popen")
+    def test_simple_command_skips_shell(self, mock_popen, mock_which):
+        """Test that commands without shell syntax are executed directly."""
+        mock_process = Mock()
+        mock_process.communicate.return_value = ("", "")
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+
+        execute("git log --oneline -5", self.context)
+        args, kwargs = mock_popen.call_args
+        self.assertEqual(args[0], ["git", "log", "--oneline", "-5"])
+        self.assertFalse(kwargs["shell"])
+
+        execute("du -h . | sort -hr", self.context)
+        args, kwargs = mock_popen.call_args
+        self.assertEqual(args[0], "du -h . | sort -hr")
+        self.assertTrue(kwargs["shell"])
+
+        # Only spaces and tabs separate words, as in /bin/sh
+        execute("ls -l\tmy\xa0file.txt", self.context)
+        args, kwargs = mock_popen.call_args
+        self.assertEqual(args[0], ["ls", "-l", "my\xa0file.txt"])
+        self.assertFalse(kwargs["shell"])
+
 
 if __name__ == "__main__":
     unittest.main()
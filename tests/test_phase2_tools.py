@@ -6,7 +6,7 @@ Tests process management, network operations, package management, and git tools.
 import unittest
 from unittest.mock import Mock, patch  # noqa: F401
 
-from nlcli.registry import ToolRegistry
+from nlcli.registry import Example, ToolCategory, ToolRegistry
 from nlcli.tools.git_tools import get_git_tools
 from nlcli.tools.network_tools import get_network_tools
 from nlcli.tools.package_tools import get_package_tools
@@ -218,13 +218,43 @@ class TestPhase2Tools(unittest.TestCase):
                 len(tool.examples) > 0, f"Tool {tool.name} should have examples"
             )
             for example in tool.examples:
-                self.assertIn(
-                    "nl", example, f"Example for {tool.name} should have 'nl' key"
-                )
-                self.assertIn(
-                    "args", example, f"Example for {tool.name} should have 'args' key"
+                self.assertIsInstance(example, Example)
+                self.assertTrue(example.nl, f"Example for {tool.name} needs text")
+                self.assertIsInstance(
+                    example.args, dict, f"Example for {tool.name} should have args"
                 )
 
+    def test_tools_grouped_by_category(self):
+        """Test that built-in tools are bucketed by category."""
+        git_names = {
+            tool.name for tool in self.registry.get_tools_by_category(ToolCategory.GIT)
+        }
+        self.assertEqual(git_names, {tool.name for tool in get_git_tools()})
+
+        network_tools = self.registry.get_tools_by_category(ToolCategory.NETWORK)
+        self.assertIn("dns_lookup", [tool.name for tool in network_tools])
+
+    def test_reload_plugins_keeps_builtin_tools(self):
+        """Test that reloading plugins only drops plugin tools."""
+        builtin_names = set(self.registry.tools) - {
+            tool.name
+            for tool in self.registry.get_tools_by_category(ToolCategory.PLUGIN)
+        }
+
+        self.registry.reload_plugins()
+
+        self.assertTrue(builtin_names.issubset(self.registry.tools))
+
+    def test_tool_lists_are_cached(self):
+        """Test that tool schemas are built once and reused."""
+        for get_tools in (
+            get_process_tools,
+            get_network_tools,
+            get_package_tools,
+            get_git_tools,
+        ):
+            self.assertIs(get_tools(), get_tools())
+
     def test_tool_keywords(self):
         """Test that tools have appropriate keywords for matching."""
         all_tools = (
@@ -239,7 +269,7 @@ class TestPhase2Tools(unittest.TestCase):
                 len(tool.keywords) > 0, f"Tool {tool.name} should have keywords"
             )
             self.assertIsInstance(
-                tool.keywords, list, f"Tool {tool.name} keywords should be a list"
+                tool.keywords, tuple, f"Tool {tool.name} keywords should be a tuple"
             )
 
 
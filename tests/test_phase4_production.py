@@ -3,8 +3,11 @@ Test Phase 4 Production Ready Features
 Tests for security, performance, error recovery, telemetry, and enterprise features.
 """
 
+import gc
+import json
 import os
 import tempfile
+import threading
 import time
 import unittest
 from pathlib import Path
@@ -50,10 +53,13 @@ from nlcli.security import (  # noqa: F401
     get_security_auditor,
 )
 from nlcli.telemetry import (  # noqa: F401
+    Event,
     EventLogger,
     EventType,
+    FixedWidthHistogram,
     MetricsCollector,
     MetricType,
+    RingBuffer,
     SessionManager,
     TelemetryManager,
     get_telemetry_manager,
@@ -141,6 +147,23 @@ class TestSecurity(unittest.TestCase):
         violations = auditor.audit_command(intent, self.context)
         self.assertTrue(len(violations) > 0)
 
+    def test_path_free_command_skips_path_audit(self):
+        """Test that commands without paths produce no path violations."""
+        self.assertEqual(self.auditor._audit_file_paths("ls -la"), [])
+        self.assertTrue(self.auditor._audit_file_paths("cat /etc/passwd"))
+
+    def test_blocked_prefix_matching(self):
+        """Test blocked directory lookup with nested prefixes."""
+        policy = SecurityPolicy(blocked_directories={"/var", "/var/lib", "/var/log"})
+        auditor = SecurityAuditor(policy)
+
+        self.assertEqual(
+            sorted(auditor._match_blocked_prefixes("/var/lib/x")),
+            ["/var", "/var/lib"],
+        )
+        self.assertEqual(auditor._match_blocked_prefixes("/var/mail"), ["/var"])
+        self.assertEqual(auditor._match_blocked_prefixes("/usr/bin"), [])
+
     def test_command_sanitizer(self):
         """Test command sanitization."""
         sanitizer = CommandSanitizer()
@@ -368,6 +391,119 @@ class TestTelemetry(unittest.TestCase):
         self.metrics.record_timer("test_timer", 1.5)
         self.assertEqual(len(self.metrics.timers["test_timer"]), 1)
 
+    def test_metrics_summary_percentiles(self):
+        """Test histogram percentiles in the metrics summary."""
+        for value in range(1, 101):
+            self.metrics.record_histogram("latency", float(value))
+
+        stats = self.metrics.get_metrics_summary()["histograms"]["latency"]
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["min"], 1.0)
+        self.assertEqual(stats["max"], 100.0)
+        self.assertAlmostEqual(stats["p95"], 96.0, delta=96.0 * 0.03)
+        self.assertEqual(stats["p99"], 100.0)
+
+    def test_concurrent_counter_increments(self):
+        """Test that counter increments from several threads are not lost."""
+
+        def worker():
+            for _ in range(1000):
+                self.metrics.increment_counter("concurrent")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.metrics.counters["concurrent"], 4000)
+
+        self.metrics.clear_metrics()
+        self.assertNotIn("concurrent", self.metrics.get_metrics_summary()["counters"])
+
+    def test_counter_shards_retired_with_threads(self):
+        """Test that short-lived threads do not leave counter shards behind."""
+        for _ in range(50):
+            threads = [
+                threading.Thread(target=self.metrics.increment_counter, args=("hits",))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        gc.collect()
+
+        self.assertLessEqual(len(self.metrics._counter_shards), 4)
+        self.assertEqual(self.metrics.counters["hits"], 200)
+
+        self.metrics.increment_counter("hits")
+        self.assertEqual(self.metrics.get_metrics_summary()["counters"]["hits"], 201)
+
+    def test_untagged_counters_materialized_on_summary(self):
+        """Test that buffered counter increments reach the raw metrics."""
+        metrics = MetricsCollector(retain_raw=True)
+        metrics.increment_counter("fast")
+        metrics.increment_counter("tagged", tags={"tool": "ls"})
+        self.assertEqual(len(metrics.metrics), 1)
+
+        summary = metrics.get_metrics_summary()
+        self.assertEqual(summary["total_metrics"], 2)
+        names = {metric.name for metric in metrics.metrics}
+        self.assertEqual(names, {"fast", "tagged"})
+
+    def test_raw_metrics_not_retained_by_default(self):
+        """Test that only aggregates are kept without raw retention."""
+        self.metrics.increment_counter("hits", 2)
+        self.metrics.record_timer("latency", 0.5)
+
+        self.assertEqual(len(self.metrics.metrics), 0)
+        self.assertEqual(self.metrics.get_metrics_summary()["total_metrics"], 3)
+
+    def test_summary_cache_invalidation(self):
+        """Test that cached summaries are refreshed by new data."""
+        self.metrics.increment_counter("hits")
+        first = self.metrics.get_metrics_summary()
+        self.assertEqual(self.metrics.get_metrics_summary(), first)
+
+        # Callers get copies, so changing one cannot corrupt the cache
+        first["counters"]["hits"] = 100
+        self.assertEqual(self.metrics.get_metrics_summary()["counters"]["hits"], 1)
+
+        self.metrics.increment_counter("hits")
+        self.assertEqual(self.metrics.get_metrics_summary()["counters"]["hits"], 2)
+
+        event_logger = EventLogger()
+        event_logger.log_command_execution(command="ls", success=True, duration=0.1)
+        self.assertEqual(event_logger.get_events_summary()["total_events"], 1)
+        event_logger.log_command_execution(command="pwd", success=False, duration=0.2)
+        self.assertEqual(event_logger.get_events_summary()["total_events"], 2)
+
+    def test_ring_buffer(self):
+        """Test ring buffer wraparound and indexing."""
+        buffer = RingBuffer(maxlen=3)
+        for value in range(5):
+            buffer.append(value)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(list(buffer), [2, 3, 4])
+        self.assertEqual((buffer[0], buffer[-1]), (2, 4))
+        with self.assertRaises(IndexError):
+            buffer[3]
+
+    def test_fixed_width_histogram(self):
+        """Test bounded histogram bucketing."""
+        histogram = FixedWidthHistogram()
+        for value in (0.0, 0.001, 0.01, 0.1, 5000.0):
+            histogram.record(value)
+
+        self.assertEqual(len(histogram), 5)
+        self.assertEqual(len(histogram.buckets), histogram.bucket_count)
+        self.assertEqual(histogram.min, 0.0)
+        self.assertEqual(histogram.max, 5000.0)
+        self.assertEqual(histogram.percentiles((100,)), [5000.0])
+        self.assertAlmostEqual(histogram.percentiles((50,))[0], 0.01, delta=0.001)
+
     def test_event_logging(self):
         """Test event logging."""
         with tempfile.NamedTemporaryFile(delete=False) as f:
@@ -381,6 +517,11 @@ class TestTelemetry(unittest.TestCase):
         # Check that event was recorded
         self.assertEqual(len(event_logger.events), 1)
 
+        # Check that the background writer persisted it
+        event_logger.flush()
+        record = json.loads(Path(temp_path).read_text().splitlines()[-1])
+        self.assertEqual(record["properties"]["command"], "ls -la")
+
         # Cleanup
         try:
             os.unlink(temp_path)
@@ -388,6 +529,76 @@ class TestTelemetry(unittest.TestCase):
             # On Windows, the file might still be in use
             pass
 
+    def test_event_log_non_string_keys(self):
+        """Test that one unusual record does not drop its whole batch."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = Path(temp_dir) / "events.log"
+            event_logger = EventLogger(log_path)
+            event_logger.log_event(
+                Event(event_type=EventType.CACHE_HIT, properties={1: "int key"})
+            )
+            event_logger.log_event(
+                Event(event_type=EventType.CACHE_MISS, properties={"big": 2**70})
+            )
+            event_logger.log_event(
+                Event(event_type=EventType.CACHE_MISS, properties={(1, 2): "tuple"})
+            )
+            event_logger.log_command_execution(command="ls", success=True, duration=0)
+            event_logger.flush()
+
+            records = [json.loads(line) for line in log_path.read_text().splitlines()]
+            event_logger.close()
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(
+            [record["properties"] for record in records[:2]],
+            [{"1": "int key"}, {"big": 2**70}],
+        )
+        self.assertEqual(records[-1]["properties"]["command"], "ls")
+
+    def test_event_writer_lifecycle(self):
+        """Test that queued events are written when the logger goes away."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = Path(temp_dir) / "events.log"
+            event_logger = EventLogger(log_path)
+            writer = event_logger._writer_thread
+            for index in range(250):
+                event_logger.log_command_execution(
+                    command=f"echo {index}", success=True, duration=0
+                )
+            event_logger.close()
+
+            self.assertFalse(writer.is_alive())
+            self.assertEqual(len(log_path.read_text().splitlines()), 250)
+            event_logger.log_event(Event(event_type=EventType.CACHE_HIT))
+            event_logger.flush()
+
+            # An unreferenced logger stops its writer once collected
+            event_logger = EventLogger(log_path)
+            writer = event_logger._writer_thread
+            event_logger.log_event(Event(event_type=EventType.CACHE_MISS))
+            del event_logger
+            gc.collect()
+
+            self.assertFalse(writer.is_alive())
+            self.assertEqual(len(log_path.read_text().splitlines()), 251)
+
+    def test_events_summary_window(self):
+        """Test that the events summary only covers the requested window."""
+        event_logger = EventLogger()
+        event_logger.log_event(
+            Event(event_type=EventType.CACHE_MISS, timestamp=time.time() - 7200)
+        )
+        event_logger.log_event(Event(event_type=EventType.CACHE_HIT))
+
+        self.assertEqual(event_logger.get_events_summary(hours=1)["total_events"], 1)
+        self.assertEqual(event_logger.get_events_summary(hours=3)["total_events"], 2)
+
+        # Default timestamps share the clock used by callers and sessions
+        self.assertAlmostEqual(
+            Event(event_type=EventType.CACHE_HIT).timestamp, time.time(), delta=1
+        )
+
     def test_session_management(self):
         """Test session management."""
         session_manager = SessionManager()
@@ -407,6 +618,19 @@ class TestTelemetry(unittest.TestCase):
         self.assertEqual(session.commands_executed, 5)
         self.assertIn("test_plugin", session.plugins_used)
 
+        # Plugin usage is counted once per session
+        session_manager.update_session(session_id, plugins_used="test_plugin")
+        other_id = session_manager.start_session()
+        session_manager.update_session(other_id, plugins_used="test_plugin")
+        self.assertEqual(
+            session_manager.get_session_analytics()["most_used_plugins"],
+            {"test_plugin": 2},
+        )
+
+        # Increment a counter field
+        session_manager.increment_session_counter(session_id, "commands_executed")
+        self.assertEqual(session.commands_executed, 6)
+
     def test_telemetry_manager(self):
         """Test telemetry manager."""
         # Start session